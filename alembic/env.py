@@ -9,7 +9,8 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
 from app.core.config import settings
-from app.models import Base
+from app.models import agent, usage  # noqa: F401  (register tables on Base.metadata)
+from app.models.base import Base
 
 # this is the Alembic Config object
 config = context.config
@@ -0,0 +1,34 @@
+"""add covering index on api_usage_logs.created_at
+
+Revision ID: 977e2f727bf9
+Revises: 2a3b4c5d6e7f
+Create Date: 2026-10-14 09:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "977e2f727bf9"
+down_revision = "2a3b4c5d6e7f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    # created_at 범위 조건 + 토큰 합계를 index-only scan으로 처리하기 위한 covering index.
+    # leading column이 같으므로 기존 단일 컬럼 인덱스를 대체한다.
+    op.create_index(
+        "ix_api_usage_logs_created_at_covering",
+        "api_usage_logs",
+        ["created_at"],
+        postgresql_include=["model", "input_tokens", "output_tokens", "cached_tokens"],
+    )
+    op.drop_index("ix_api_usage_logs_created_at", table_name="api_usage_logs")
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.create_index("ix_api_usage_logs_created_at", "api_usage_logs", ["created_at"])
+    op.drop_index("ix_api_usage_logs_created_at_covering", table_name="api_usage_logs")
@@ -0,0 +1,46 @@
+"""create mv_api_usage_daily materialized view
+
+Revision ID: 9a6f15c82079
+Revises: 977e2f727bf9
+Create Date: 2026-10-14 09:30:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9a6f15c82079"
+down_revision = "977e2f727bf9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    # 일(UTC) x 모델 단위 사용량 집계. month/all 통계는 이 뷰를 읽는다.
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW mv_api_usage_daily AS
+        SELECT
+            (created_at AT TIME ZONE 'UTC')::date AS day,
+            model,
+            SUM(input_tokens)::bigint AS input_tokens,
+            SUM(output_tokens)::bigint AS output_tokens,
+            SUM(cached_tokens)::bigint AS cached_tokens,
+            COUNT(*) AS request_count
+        FROM api_usage_logs
+        GROUP BY 1, 2
+        """
+    )
+    # REFRESH MATERIALIZED VIEW CONCURRENTLY 에는 unique index가 필요
+    op.create_index(
+        "ix_mv_api_usage_daily_day_model",
+        "mv_api_usage_daily",
+        ["day", "model"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_api_usage_daily")
@@ -0,0 +1,61 @@
+"""add session and request log lookup indexes
+
+Revision ID: 87f36111a02e
+Revises: 9a6f15c82079
+Create Date: 2026-10-14 10:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "87f36111a02e"
+down_revision = "9a6f15c82079"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    # 운영 중인 로그 테이블에 쓰기 락을 걸지 않도록 CONCURRENTLY로 생성 (트랜잭션 밖에서 실행)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_agent_request_logs_session_requested",
+            "agent_request_logs",
+            ["session_id", sa.text("requested_at DESC")],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_api_usage_logs_session",
+            "api_usage_logs",
+            ["session_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_api_usage_logs_request_log_id",
+            "api_usage_logs",
+            ["request_log_id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_api_usage_logs_request_log_id",
+            table_name="api_usage_logs",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_api_usage_logs_session",
+            table_name="api_usage_logs",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_agent_request_logs_session_requested",
+            table_name="agent_request_logs",
+            postgresql_concurrently=True,
+        )
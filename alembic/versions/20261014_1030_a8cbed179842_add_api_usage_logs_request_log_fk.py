@@ -0,0 +1,46 @@
+"""add api_usage_logs.request_log_id foreign key
+
+Revision ID: a8cbed179842
+Revises: 87f36111a02e
+Create Date: 2026-10-14 10:30:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a8cbed179842"
+down_revision = "87f36111a02e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    # 참조 대상이 없는 usage 로그는 FK 검증 전에 연결만 끊는다
+    op.execute(
+        """
+        UPDATE api_usage_logs AS u
+        SET request_log_id = NULL
+        WHERE u.request_log_id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM agent_request_logs r WHERE r.id = u.request_log_id)
+        """
+    )
+    # NOT VALID로 추가한 뒤 별도 트랜잭션에서 VALIDATE 하여 검증 중 테이블 쓰기를 막지 않도록 함.
+    # FK를 받치는 인덱스(ix_api_usage_logs_request_log_id)는 이전 리비전에서 생성됨.
+    op.create_foreign_key(
+        "fk_api_usage_logs_request_log",
+        "api_usage_logs",
+        "agent_request_logs",
+        ["request_log_id"],
+        ["id"],
+        ondelete="CASCADE",
+        postgresql_not_valid=True,
+    )
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE api_usage_logs VALIDATE CONSTRAINT fk_api_usage_logs_request_log")
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_constraint("fk_api_usage_logs_request_log", "api_usage_logs", type_="foreignkey")
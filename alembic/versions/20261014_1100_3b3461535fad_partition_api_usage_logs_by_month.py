@@ -0,0 +1,165 @@
+"""partition api_usage_logs by month
+
+Revision ID: 3b3461535fad
+Revises: a8cbed179842
+Create Date: 2026-10-14 11:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3b3461535fad"
+down_revision = "a8cbed179842"
+branch_labels = None
+depends_on = None
+
+_CREATE_MV_SQL = """
+CREATE MATERIALIZED VIEW mv_api_usage_daily AS
+SELECT
+    (created_at AT TIME ZONE 'UTC')::date AS day,
+    model,
+    SUM(input_tokens)::bigint AS input_tokens,
+    SUM(output_tokens)::bigint AS output_tokens,
+    SUM(cached_tokens)::bigint AS cached_tokens,
+    COUNT(*) AS request_count
+FROM api_usage_logs
+GROUP BY 1, 2
+"""
+
+_COLUMNS = (
+    "id, model, input_tokens, output_tokens, cached_tokens, created_at, session_id, request_log_id"
+)
+
+
+def _create_indexes_and_mv() -> None:
+    """Create the api_usage_logs indexes and the daily materialized view."""
+    op.create_index(
+        "ix_api_usage_logs_created_at_covering",
+        "api_usage_logs",
+        ["created_at"],
+        postgresql_include=["model", "input_tokens", "output_tokens", "cached_tokens"],
+    )
+    op.create_index("ix_api_usage_logs_session", "api_usage_logs", ["session_id"])
+    op.create_index("ix_api_usage_logs_request_log_id", "api_usage_logs", ["request_log_id"])
+    op.execute(_CREATE_MV_SQL)
+    op.create_index(
+        "ix_mv_api_usage_daily_day_model",
+        "mv_api_usage_daily",
+        ["day", "model"],
+        unique=True,
+    )
+
+
+def _detach_old_table() -> None:
+    """Rename the current table out of the way and free its index/constraint names."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_api_usage_daily")
+    op.execute("ALTER TABLE api_usage_logs RENAME TO api_usage_logs_old")
+    op.execute("ALTER INDEX api_usage_logs_pkey RENAME TO api_usage_logs_old_pkey")
+    op.drop_constraint("fk_api_usage_logs_request_log", "api_usage_logs_old", type_="foreignkey")
+    op.drop_index("ix_api_usage_logs_created_at_covering", table_name="api_usage_logs_old")
+    op.drop_index("ix_api_usage_logs_session", table_name="api_usage_logs_old")
+    op.drop_index("ix_api_usage_logs_request_log_id", table_name="api_usage_logs_old")
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    _detach_old_table()
+
+    # 파티션 키(created_at)는 PK에 포함되어야 함
+    op.execute(
+        """
+        CREATE TABLE api_usage_logs (
+            id uuid NOT NULL,
+            model varchar(64) NOT NULL,
+            input_tokens integer NOT NULL,
+            output_tokens integer NOT NULL,
+            cached_tokens integer NOT NULL DEFAULT 0,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            session_id uuid,
+            request_log_id uuid,
+            CONSTRAINT api_usage_logs_pkey PRIMARY KEY (id, created_at),
+            CONSTRAINT fk_api_usage_logs_request_log FOREIGN KEY (request_log_id)
+                REFERENCES agent_request_logs (id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+
+    # 월(UTC) 단위 파티션 생성 함수. 앱의 유지보수 태스크가 다음 달 파티션을 미리 만든다.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION create_api_usage_logs_partition(month_start date)
+        RETURNS void
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            from_ts timestamptz := date_trunc('month', month_start::timestamp) AT TIME ZONE 'UTC';
+            to_ts timestamptz :=
+                (date_trunc('month', month_start::timestamp) + interval '1 month')
+                AT TIME ZONE 'UTC';
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF api_usage_logs '
+                'FOR VALUES FROM (%L) TO (%L)',
+                'api_usage_logs_' || to_char(month_start, 'YYYY_MM'),
+                from_ts,
+                to_ts
+            );
+        END;
+        $$
+        """
+    )
+
+    # 기존 데이터의 첫 달부터 두 달 뒤까지 파티션을 만들고, 범위 밖 행은 default 파티션이 받음
+    op.execute(
+        """
+        SELECT create_api_usage_logs_partition(m::date)
+        FROM generate_series(
+            date_trunc(
+                'month',
+                COALESCE(
+                    (SELECT min(created_at) FROM api_usage_logs_old),
+                    now()
+                ) AT TIME ZONE 'UTC'
+            ),
+            date_trunc('month', now() AT TIME ZONE 'UTC') + interval '2 months',
+            interval '1 month'
+        ) AS m
+        """
+    )
+    op.execute("CREATE TABLE api_usage_logs_default PARTITION OF api_usage_logs DEFAULT")
+
+    op.execute(f"INSERT INTO api_usage_logs ({_COLUMNS}) SELECT {_COLUMNS} FROM api_usage_logs_old")
+    op.drop_table("api_usage_logs_old")
+
+    # 파티션 테이블의 인덱스는 부모에 생성하면 모든 파티션에 전파됨 (CONCURRENTLY 불가)
+    _create_indexes_and_mv()
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    _detach_old_table()
+
+    op.execute(
+        """
+        CREATE TABLE api_usage_logs (
+            id uuid NOT NULL,
+            model varchar(64) NOT NULL,
+            input_tokens integer NOT NULL,
+            output_tokens integer NOT NULL,
+            cached_tokens integer NOT NULL DEFAULT 0,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            session_id uuid,
+            request_log_id uuid,
+            CONSTRAINT api_usage_logs_pkey PRIMARY KEY (id),
+            CONSTRAINT fk_api_usage_logs_request_log FOREIGN KEY (request_log_id)
+                REFERENCES agent_request_logs (id) ON DELETE CASCADE
+        )
+        """
+    )
+    op.execute(f"INSERT INTO api_usage_logs ({_COLUMNS}) SELECT {_COLUMNS} FROM api_usage_logs_old")
+    # 파티션(자식 테이블)도 함께 삭제됨
+    op.drop_table("api_usage_logs_old")
+    op.execute("DROP FUNCTION IF EXISTS create_api_usage_logs_partition(date)")
+
+    _create_indexes_and_mv()
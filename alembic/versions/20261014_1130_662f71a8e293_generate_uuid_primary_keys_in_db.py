@@ -0,0 +1,32 @@
+"""generate uuid primary keys in the database
+
+Revision ID: 662f71a8e293
+Revises: 3b3461535fad
+Create Date: 2026-10-14 11:30:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "662f71a8e293"
+down_revision = "3b3461535fad"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    # gen_random_uuid()는 PostgreSQL 13+ 내장, 그 이전 버전은 pgcrypto가 제공
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+    op.alter_column("agent_request_logs", "id", server_default=sa.text("gen_random_uuid()"))
+    # 파티션 테이블의 부모에 설정하면 모든 파티션에 적용됨
+    op.alter_column("api_usage_logs", "id", server_default=sa.text("gen_random_uuid()"))
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.alter_column("api_usage_logs", "id", server_default=None)
+    op.alter_column("agent_request_logs", "id", server_default=None)
@@ -0,0 +1,66 @@
+"""replace mv_api_usage_daily with the incrementally maintained api_usage_daily table
+
+Revision ID: 1a396023ca96
+Revises: 662f71a8e293
+Create Date: 2026-10-14 12:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1a396023ca96"
+down_revision = "662f71a8e293"
+branch_labels = None
+depends_on = None
+
+_DAILY_SELECT_SQL = """
+SELECT
+    (created_at AT TIME ZONE 'UTC')::date AS day,
+    model,
+    SUM(input_tokens)::bigint AS input_tokens,
+    SUM(output_tokens)::bigint AS output_tokens,
+    SUM(cached_tokens)::bigint AS cached_tokens,
+    COUNT(*) AS request_count
+FROM api_usage_logs
+GROUP BY 1, 2
+"""
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    # 앱이 usage INSERT와 같은 트랜잭션에서 ON CONFLICT upsert로 누적한다.
+    # (day, model) PK의 선두 컬럼이 day이므로 기간 조회용 별도 인덱스는 필요 없다.
+    op.create_table(
+        "api_usage_daily",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("model", sa.String(length=64), nullable=False),
+        sa.Column("input_tokens", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("output_tokens", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("cached_tokens", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("request_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("day", "model"),
+    )
+
+    # 기존 로그 1회 backfill. 이 시점 이후의 행은 새 버전 앱이 누적하므로
+    # 이전 버전 앱이 쓰기를 멈춘 상태(배포 중단 구간)에서 실행해야 누락이 없다.
+    op.execute(
+        "INSERT INTO api_usage_daily "
+        "(day, model, input_tokens, output_tokens, cached_tokens, request_count) "
+        + _DAILY_SELECT_SQL
+    )
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_api_usage_daily")
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.execute("CREATE MATERIALIZED VIEW mv_api_usage_daily AS " + _DAILY_SELECT_SQL)
+    op.create_index(
+        "ix_mv_api_usage_daily_day_model",
+        "mv_api_usage_daily",
+        ["day", "model"],
+        unique=True,
+    )
+    op.drop_table("api_usage_daily")
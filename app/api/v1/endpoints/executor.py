@@ -1,10 +1,10 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 
 from app.core.deps import get_executor_service
 from app.core.exceptions import AppException
-from app.schemas.agent import CommandRequest, CommandResponse
+from app.schemas.agent import COMMAND_RESPONSE_ADAPTER, CommandRequest, CommandResponse
 from app.services.agent_service import ExecutorService
 
 logger = logging.getLogger(__name__)
@@ -12,6 +12,18 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _json_response(response: CommandResponse) -> Response:
+    """CommandResponse를 미리 만든 TypeAdapter로 바로 JSON 직렬화.
+
+    Response를 직접 반환하면 FastAPI가 response_model 기준으로 재검증/직렬화하는 단계를 건너뛴다.
+    (response_model은 OpenAPI 문서용으로 유지)
+    """
+    return Response(
+        content=COMMAND_RESPONSE_ADAPTER.dump_json(response),
+        media_type="application/json",
+    )
+
+
 @router.post(
     "/execute",
     response_model=CommandResponse,
@@ -21,31 +33,35 @@ router = APIRouter()
 async def execute_command(
     command_request: CommandRequest,
     executor_service: ExecutorService = Depends(get_executor_service),
-) -> CommandResponse:
+) -> Response:
     try:
         generated_command = await executor_service.execute_command(
             raw_command=command_request.raw_command,
             session_id=command_request.session_id,
         )
 
-        return CommandResponse(
-            session_id=command_request.session_id,
-            success=True,
-            command=generated_command.command,
-            reason=generated_command.reason,
-            title=generated_command.title,
-            error_message=None,
+        return _json_response(
+            CommandResponse(
+                session_id=command_request.session_id,
+                success=True,
+                command=generated_command.command,
+                reason=generated_command.reason,
+                title=generated_command.title,
+                error_message=None,
+            )
         )
 
     except AppException as e:
         # 도메인 에러: 200 + success=False
-        return CommandResponse(
-            session_id=command_request.session_id,
-            success=False,
-            command=None,
-            reason=None,
-            title=None,
-            error_message=e.message,
+        return _json_response(
+            CommandResponse(
+                session_id=command_request.session_id,
+                success=False,
+                command=None,
+                reason=None,
+                title=None,
+                error_message=e.message,
+            )
         )
 
     except Exception as e:
@@ -3,10 +3,10 @@
 import logging
 from typing import Literal
 
-from fastapi import APIRouter, Query, status
+from fastapi import APIRouter, Query, Response, status
 
 from app.core.deps import DBSession
-from app.schemas.usage import UsageResponse, UsageStatsData
+from app.schemas.usage import USAGE_RESPONSE_ADAPTER, UsageResponse, UsageStatsData
 from app.services.usage_service import UsageService
 
 logger = logging.getLogger(__name__)
@@ -26,7 +26,7 @@ async def get_usage_stats(
         description="Period to aggregate: today, month, or all",
     ),
     db: DBSession = None,  # type: ignore[assignment]
-) -> UsageResponse:
+) -> Response:
     """Get aggregated API usage statistics.
 
     - **today**: Usage statistics for today (UTC)
@@ -36,7 +36,7 @@ async def get_usage_stats(
     service = UsageService(db)
     stats = await service.get_stats(period=period)
 
-    return UsageResponse(
+    response = UsageResponse(
         success=True,
         data=UsageStatsData(
             total_input_tokens=stats.total_input_tokens,
@@ -49,3 +49,9 @@ async def get_usage_stats(
             period_end=stats.period_end,
         ),
     )
+
+    # FastAPI의 response_model 재검증을 건너뛰고 미리 만든 TypeAdapter로 바로 직렬화
+    return Response(
+        content=USAGE_RESPONSE_ADAPTER.dump_json(response),
+        media_type="application/json",
+    )
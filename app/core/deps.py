@@ -1,10 +1,17 @@
 """Dependency injection."""
 
 from collections.abc import AsyncGenerator
+from functools import lru_cache
 from typing import Annotated
 
 from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 from app.services.agent_service import ExecutorService
@@ -13,14 +20,32 @@ from app.services.complex_command_processor import ComplexCommandProcessor
 from app.services.executor import CommandExecutor
 from app.services.pattern_matching_system import PatternMatchingSystem
 
+
+def _create_engine() -> AsyncEngine:
+    """Create the database engine according to the pool settings."""
+    if settings.DB_USE_PGBOUNCER:
+        # PgBouncer(transaction 모드)가 커넥션 풀링을 담당하므로 앱 쪽 풀은 두지 않고,
+        # 트랜잭션마다 서버 커넥션이 바뀌므로 asyncpg prepared statement 캐시를 끈다.
+        return create_async_engine(
+            settings.DATABASE_URL,
+            echo=settings.DEBUG,
+            poolclass=NullPool,
+            connect_args={"statement_cache_size": 0, "prepared_statement_cache_size": 0},
+        )
+
+    return create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DEBUG,
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+
+
 # Database engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-)
+engine = _create_engine()
 
 # Session factory
 async_session_maker = async_sessionmaker(
@@ -43,17 +68,33 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 DBSession = Annotated[AsyncSession, Depends(get_db)]
 
 
-def get_executor_service(
-    db: DBSession,
-) -> ExecutorService:
-    router = CommandRouter()
-    complex_processor = ComplexCommandProcessor()
-    pattern_system = PatternMatchingSystem(complex_processor)
-    executor = CommandExecutor()
+# 상태를 요청마다 새로 만들 필요가 없는 서비스들은 프로세스당 한 번만 생성해 재사용한다.
+# (OpenAI 클라이언트는 API 키가 없으면 생성 시 예외가 나므로 import 시점이 아닌 첫 요청 시 생성)
+@lru_cache(maxsize=1)
+def _get_command_router() -> CommandRouter:
+    return CommandRouter()
+
+
+@lru_cache(maxsize=1)
+def get_complex_command_processor() -> ComplexCommandProcessor:
+    """Get the process-wide ComplexCommandProcessor."""
+    return ComplexCommandProcessor()
+
+
+@lru_cache(maxsize=1)
+def _get_pattern_system() -> PatternMatchingSystem:
+    return PatternMatchingSystem(get_complex_command_processor())
+
+
+@lru_cache(maxsize=1)
+def _get_command_executor() -> CommandExecutor:
+    return CommandExecutor()
+
 
+def get_executor_service() -> ExecutorService:
+    # 로그는 raw asyncpg 풀로 기록하므로 요청마다 DB 세션을 열지 않는다
     return ExecutorService(
-        db=db,
-        executor=executor,
-        router=router,
-        pattern_system=pattern_system,
+        executor=_get_command_executor(),
+        router=_get_command_router(),
+        pattern_system=_get_pattern_system(),
     )
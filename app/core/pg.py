@@ -0,0 +1,41 @@
+"""Raw asyncpg connection pool for write-heavy hot paths."""
+
+import asyncio
+
+import asyncpg
+
+from app.core.config import settings
+
+_pool: asyncpg.Pool | None = None
+_pool_lock = asyncio.Lock()
+
+
+def _asyncpg_dsn(database_url: str) -> str:
+    """Convert the SQLAlchemy URL (postgresql+asyncpg://) into a plain asyncpg DSN."""
+    return database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+async def get_pool() -> asyncpg.Pool:
+    """Get the process-wide asyncpg pool, creating it on first use."""
+    global _pool
+    if _pool is not None:
+        return _pool
+
+    async with _pool_lock:
+        if _pool is None:
+            _pool = await asyncpg.create_pool(
+                _asyncpg_dsn(settings.DATABASE_URL),
+                min_size=settings.PG_POOL_MIN_SIZE,
+                max_size=settings.PG_POOL_MAX_SIZE,
+                # PgBouncer(transaction 모드)에서는 prepared statement 캐시를 사용할 수 없음
+                statement_cache_size=0 if settings.DB_USE_PGBOUNCER else 100,
+            )
+    return _pool
+
+
+async def close_pool() -> None:
+    """Close the asyncpg pool if it was created."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
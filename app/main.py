@@ -1,5 +1,7 @@
 """FastAPI application entry point."""
 
+import asyncio
+import contextlib
 import logging
 
 from fastapi import FastAPI
@@ -9,8 +11,10 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.api.v1 import api_router
 from app.core import settings, setup_logging
-from app.core.deps import async_session_maker
+from app.core.deps import async_session_maker, get_complex_command_processor
 from app.core.exceptions import AppException
+from app.core.pg import close_pool, get_pool
+from app.core.responses import ORJSONResponse
 from app.middleware import (
     LoggingMiddleware,
     RequestIDMiddleware,
@@ -20,6 +24,15 @@ from app.middleware import (
     validation_exception_handler,
 )
 from app.schemas import HealthResponse
+from app.services.command_router import normalize_cache_info
+from app.services.complex_command_processor import (
+    close_openai_client,
+    llm_call_metrics,
+    prompt_cache_info,
+)
+from app.services.log_buffer import log_buffer, usage_log_buffer
+from app.services.pattern_matching_system import kubectl_passthrough_hits
+from app.services.usage_service import UsageService
 
 # Setup logging
 setup_logging()
@@ -30,6 +43,7 @@ app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     debug=settings.DEBUG,
+    default_response_class=ORJSONResponse,
 )
 
 # Add middlewares (order matters: first added = outermost layer)
@@ -45,6 +59,43 @@ app.add_exception_handler(Exception, unhandled_exception_handler)
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
+# Background maintenance tasks started on startup, cancelled on shutdown
+_maintenance_tasks: set[asyncio.Task[None]] = set()
+
+
+async def _run_usage_maintenance_periodically(interval: int) -> None:
+    """Periodically pre-create usage log partitions and drop expired ones."""
+    while True:
+        try:
+            async with async_session_maker() as session:
+                service = UsageService(session)
+                await service.ensure_partitions()
+                if settings.USAGE_LOG_RETENTION_MONTHS > 0:
+                    dropped = await service.drop_expired_partitions(
+                        settings.USAGE_LOG_RETENTION_MONTHS
+                    )
+                    if dropped:
+                        logger.info(
+                            f"Dropped expired usage log partitions: {', '.join(dropped)}",
+                            extra={"request_id": "usage-maintenance"},
+                        )
+        except Exception as e:
+            logger.error(
+                f"Usage maintenance failed: {e}",
+                extra={"request_id": "usage-maintenance"},
+            )
+        await asyncio.sleep(interval)
+
+
+async def _keep_prompt_cache_warm(interval: int) -> None:
+    """Send a minimal LLM request on startup and every interval to keep the prompt cache warm."""
+    while True:
+        try:
+            await get_complex_command_processor().warmup()
+        except Exception as e:
+            logger.warning(f"LLM warmup failed: {e}", extra={"request_id": "llm-warmup"})
+        await asyncio.sleep(interval)
+
 
 @app.get("/health", response_model=HealthResponse, tags=["health"])
 async def health_check() -> HealthResponse:
@@ -73,6 +124,35 @@ async def startup_event() -> None:
         extra={"request_id": "startup"},
     )
 
+    # 로그 INSERT용 asyncpg 풀을 미리 열어 둔다 (실패해도 첫 사용 시 다시 시도)
+    try:
+        await get_pool()
+    except Exception as e:
+        logger.error(f"Failed to open asyncpg pool: {e}", extra={"request_id": "startup"})
+
+    log_buffer.start()
+    usage_log_buffer.start()
+
+    if settings.USAGE_MAINTENANCE_INTERVAL > 0:
+        _maintenance_tasks.add(
+            asyncio.create_task(
+                _run_usage_maintenance_periodically(settings.USAGE_MAINTENANCE_INTERVAL)
+            )
+        )
+
+    # provider prompt cache는 몇 분 유휴 시 비워지므로 주기적으로 다시 채운다.
+    # 1024토큰 미만 prefix는 캐싱되지 않으므로 압축 프롬프트에서는 과금만 되고 효과가 없다
+    if settings.OPENAI_WARMUP_INTERVAL > 0 and not settings.OPENAI_FULL_SYSTEM_PROMPT:
+        logger.warning(
+            "OPENAI_WARMUP_INTERVAL is ignored: the compressed system prompt is below the "
+            "1024-token prompt caching threshold (set OPENAI_FULL_SYSTEM_PROMPT=true to warm up)",
+            extra={"request_id": "startup"},
+        )
+    elif settings.OPENAI_WARMUP_INTERVAL > 0:
+        _maintenance_tasks.add(
+            asyncio.create_task(_keep_prompt_cache_warm(settings.OPENAI_WARMUP_INTERVAL))
+        )
+
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
@@ -82,6 +162,49 @@ async def shutdown_event() -> None:
         extra={"request_id": "shutdown"},
     )
 
+    cache_info = normalize_cache_info()
+    logger.info(
+        f"normalize_command cache: hits={cache_info.hits} misses={cache_info.misses} "
+        f"size={cache_info.currsize}/{cache_info.maxsize}",
+        extra={"request_id": "shutdown"},
+    )
+
+    cached_tokens, input_tokens = prompt_cache_info()
+    logger.info(
+        f"LLM prompt cache: cached_tokens={cached_tokens} input_tokens={input_tokens} "
+        f"ratio={cached_tokens / input_tokens if input_tokens else 0:.2%}",
+        extra={"request_id": "shutdown"},
+    )
+    metrics = llm_call_metrics()
+    logger.info(
+        f"LLM calls: retries={metrics['retries']} rate_limited={metrics['rate_limited']} "
+        f"in_flight={metrics['in_flight']}",
+        extra={"request_id": "shutdown"},
+    )
+    logger.info(
+        f"kubectl passthrough: hits={kubectl_passthrough_hits()}",
+        extra={"request_id": "shutdown"},
+    )
+
+    for task in _maintenance_tasks:
+        task.cancel()
+    for task in _maintenance_tasks:
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    _maintenance_tasks.clear()
+
+    # 버퍼에 남은 로그를 모두 기록한 뒤 풀을 닫는다
+    await log_buffer.stop()
+    await usage_log_buffer.stop()
+    logger.info(
+        f"Log buffers: dropped_rows request={log_buffer.dropped_rows} "
+        f"usage={usage_log_buffer.dropped_rows}",
+        extra={"request_id": "shutdown"},
+    )
+    await close_pool()
+    # 공유 OpenAI 클라이언트의 keep-alive 커넥션 정리
+    await close_openai_client()
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -4,17 +4,17 @@ import logging
 
 from fastapi import Request, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.core.exceptions import AppException
 from app.core.logging import LoggerAdapter
+from app.core.responses import ORJSONResponse
 from app.middleware.request_id import get_request_id
 
 logger = logging.getLogger(__name__)
 
 
-async def app_exception_handler(request: Request, exc: AppException) -> JSONResponse:
+async def app_exception_handler(request: Request, exc: AppException) -> ORJSONResponse:
     """Handle custom application exceptions."""
     request_id = get_request_id()
     adapter = LoggerAdapter(logger, {"request_id": request_id})
@@ -28,7 +28,7 @@ async def app_exception_handler(request: Request, exc: AppException) -> JSONResp
         },
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
@@ -42,7 +42,7 @@ async def app_exception_handler(request: Request, exc: AppException) -> JSONResp
 
 async def validation_exception_handler(
     request: Request, exc: RequestValidationError
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Handle validation errors."""
     request_id = get_request_id()
     adapter = LoggerAdapter(logger, {"request_id": request_id})
@@ -53,7 +53,7 @@ async def validation_exception_handler(
         extra={"validation_errors": errors},
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "success": False,
@@ -65,7 +65,7 @@ async def validation_exception_handler(
     )
 
 
-async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> JSONResponse:
+async def http_exception_handler(request: Request, exc: StarletteHTTPException) -> ORJSONResponse:
     """Handle HTTP exceptions."""
     request_id = get_request_id()
     adapter = LoggerAdapter(logger, {"request_id": request_id})
@@ -75,7 +75,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException)
         extra={"status_code": exc.status_code},
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
@@ -87,7 +87,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException)
     )
 
 
-async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def unhandled_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """Handle unhandled exceptions."""
     request_id = get_request_id()
     adapter = LoggerAdapter(logger, {"request_id": request_id})
@@ -97,7 +97,7 @@ async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONR
         exc_info=exc,
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "success": False,
@@ -1,11 +1,37 @@
-"""Database models package."""
+"""Database models package.
 
-from app.models.agent import AgentRequestLog
-from app.models.base import Base
-from app.models.usage import APIUsageLog
+Models are imported lazily on first attribute access (PEP 562) so that importing
+``app.models`` does not set up the SQLAlchemy mappers unless they are used.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from app.models.agent import AgentRequestLog
+    from app.models.base import Base
+    from app.models.usage import APIUsageDaily, APIUsageLog
+
+# attribute name -> defining module
+_LAZY_IMPORTS = {
+    "Base": "app.models.base",
+    "AgentRequestLog": "app.models.agent",
+    "APIUsageLog": "app.models.usage",
+    "APIUsageDaily": "app.models.usage",
+}
 
 __all__ = [
     "Base",
     "AgentRequestLog",
     "APIUsageLog",
+    "APIUsageDaily",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value  # 이후 접근은 모듈 dict에서 바로 조회
+    return value
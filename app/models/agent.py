@@ -1,9 +1,9 @@
 """Agent model for database."""
 
 from datetime import datetime
-from uuid import UUID, uuid4
+from uuid import UUID
 
-from sqlalchemy import Boolean, DateTime, String, Text
+from sqlalchemy import Boolean, DateTime, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -18,7 +18,7 @@ class AgentRequestLog(Base):
 
     __tablename__ = "agent_request_logs"
 
-    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(primary_key=True, server_default=text("gen_random_uuid()"))
     raw_command: Mapped[str] = mapped_column(String(512), nullable=False)
     is_success: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     requested_at: Mapped[datetime] = mapped_column(
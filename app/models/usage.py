@@ -1,9 +1,17 @@
 """API Usage log model for tracking OpenAI API usage."""
 
-from datetime import datetime
-from uuid import UUID, uuid4
+from datetime import date, datetime
+from uuid import UUID
 
-from sqlalchemy import DateTime, Integer, String
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -11,20 +19,34 @@ from app.models.base import Base
 
 
 class APIUsageLog(Base):
-    """OpenAI API 사용량 기록 모델."""
+    """OpenAI API 사용량 기록 모델.
+
+    created_at 기준 월 단위 RANGE 파티션 테이블이므로 PK는 (id, created_at).
+    """
 
     __tablename__ = "api_usage_logs"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
+    # INSERT ... RETURNING으로 id/created_at을 바로 채워 refresh() 왕복이 필요 없게 함
+    __mapper_args__ = {"eager_defaults": True}
 
-    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(primary_key=True, server_default=text("gen_random_uuid()"))
     model: Mapped[str] = mapped_column(String(64), nullable=False)
     input_tokens: Mapped[int] = mapped_column(Integer, nullable=False)
     output_tokens: Mapped[int] = mapped_column(Integer, nullable=False)
     cached_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, default=func.now()
+        DateTime(timezone=True), primary_key=True, nullable=False, default=func.now()
     )
     session_id: Mapped[UUID | None] = mapped_column(nullable=True, default=None)
-    request_log_id: Mapped[UUID | None] = mapped_column(nullable=True, default=None)
+    request_log_id: Mapped[UUID | None] = mapped_column(
+        ForeignKey(
+            "agent_request_logs.id",
+            name="fk_api_usage_logs_request_log",
+            ondelete="CASCADE",
+        ),
+        nullable=True,
+        default=None,
+    )
 
     def __repr__(self) -> str:
         """String representation of APIUsageLog."""
@@ -34,3 +56,28 @@ class APIUsageLog(Base):
             f"input_tokens={self.input_tokens}, "
             f"output_tokens={self.output_tokens})>"
         )
+
+
+class APIUsageDaily(Base):
+    """일(UTC) x 모델 단위 사용량 집계 (rollup) 모델.
+
+    usage 행을 INSERT 하는 같은 트랜잭션에서 ON CONFLICT upsert로 누적하므로
+    통계 조회는 원본 테이블 대신 기간 내 일수 x 모델 수 만큼의 행만 읽는다.
+    """
+
+    __tablename__ = "api_usage_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    model: Mapped[str] = mapped_column(String(64), primary_key=True)
+    input_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    output_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    cached_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    request_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        """String representation of APIUsageDaily."""
+        return (
+            f"<APIUsageDaily(day={self.day}, "
+            f"model={self.model!r}, "
+            f"request_count={self.request_count})>"
+        )
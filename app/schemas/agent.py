@@ -3,6 +3,7 @@ from uuid import UUID
 from pydantic import (
     BaseModel,
     Field,
+    TypeAdapter,
 )
 
 
@@ -38,3 +39,7 @@ class CommandResponse(BaseModel):
             }
         }
     }
+
+
+# 응답 직렬화용 TypeAdapter (모듈 로드 시 1회 생성, 요청마다 스키마를 다시 훑지 않음)
+COMMAND_RESPONSE_ADAPTER: TypeAdapter[CommandResponse] = TypeAdapter(CommandResponse)
@@ -3,7 +3,7 @@
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class UsageStatsData(BaseModel):
@@ -24,3 +24,7 @@ class UsageResponse(BaseModel):
 
     success: bool = Field(default=True, description="Whether the request was successful")
     data: UsageStatsData = Field(..., description="Usage statistics data")
+
+
+# 응답 직렬화용 TypeAdapter (모듈 로드 시 1회 생성)
+USAGE_RESPONSE_ADAPTER: TypeAdapter[UsageResponse] = TypeAdapter(UsageResponse)
@@ -1,18 +1,17 @@
 from __future__ import annotations
 
+import logging
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.core.config import settings
 from app.core.exceptions import AppException
-from app.models.agent import AgentRequestLog
-from app.models.usage import APIUsageLog
 from app.services.command_router import CommandRouter
 from app.services.executor import CommandExecutionResult, CommandExecutor
-from app.services.pattern_matching_system import PatternMatchingSystem
-from app.services.types import GeneratedCommand, UsageInfo
+from app.services.log_buffer import log_buffer, make_log_row
+from app.services.pattern_matching_system import PatternMatchingSystem, kubectl_passthrough
+from app.services.types import GeneratedCommand
+
+logger = logging.getLogger(__name__)
 
 
 class ExecutorService:
@@ -20,20 +19,19 @@ class ExecutorService:
 
     def __init__(
         self,
-        db: AsyncSession,
         router: CommandRouter,
         pattern_system: PatternMatchingSystem,
         executor: CommandExecutor | None = None,
     ) -> None:
         """ExecutorService 초기화
 
+        로그는 raw asyncpg 풀로 기록하므로 요청 스코프의 DB 세션을 받지 않는다.
+
         Args:
-            db: FastAPI DI로 주입받는 AsyncSession(DBSession)
             router: 자연어 명령 정규화/토크나이즈를 담당하는 라우터
             pattern_system: 패턴 매칭 기반 kubectl 명령 생성기
             executor: 실제 쉘 명령 실행기 (기본값: CommandExecutor)
         """
-        self.db = db
         self.router = router
         self.pattern_system = pattern_system
         self.executor = executor or CommandExecutor()
@@ -68,50 +66,6 @@ class ExecutorService:
 
         return result
 
-    async def _log_request(
-        self,
-        *,
-        raw_command: str,
-        session_id: UUID | None,
-        generated_command: str | None,
-        is_success: bool,
-        error_message: str | None,
-    ) -> UUID:
-        """자연어 → kubectl 변환 결과를 요청 로그 테이블에 기록.
-
-        Returns:
-            UUID: Created log record ID for correlation with usage log
-        """
-        log = AgentRequestLog(
-            raw_command=raw_command,
-            is_success=is_success,
-            executed_command=generated_command,
-            error_message=error_message,
-            session_id=session_id,
-        )
-        self.db.add(log)
-        await self.db.commit()
-        await self.db.refresh(log)
-        return log.id
-
-    async def _log_usage(
-        self,
-        usage: UsageInfo,
-        session_id: UUID | None = None,
-        request_log_id: UUID | None = None,
-    ) -> None:
-        """OpenAI API 사용량을 DB에 기록."""
-        usage_log = APIUsageLog(
-            model=settings.OPENAI_MODEL,
-            input_tokens=usage.input_tokens,
-            output_tokens=usage.output_tokens,
-            cached_tokens=usage.cached_tokens,
-            session_id=session_id,
-            request_log_id=request_log_id,
-        )
-        self.db.add(usage_log)
-        await self.db.commit()
-
     async def _log_execution(
         self,
         kubectl_command: str,
@@ -122,18 +76,38 @@ class ExecutorService:
         session_id: UUID | None = context.get("session_id")
         raw_command: str = context.get("raw_command", kubectl_command)
 
-        is_success = result.return_code == 0
-        error_message: str | None = result.stderr or None
-
-        log = AgentRequestLog(
-            raw_command=raw_command,
-            is_success=is_success,
-            executed_command=kubectl_command,
-            error_message=error_message,
-            session_id=session_id,
+        await log_buffer.submit(
+            make_log_row(
+                raw_command=raw_command,
+                session_id=session_id,
+                executed_command=kubectl_command,
+                is_success=result.return_code == 0,
+                error_message=result.stderr or None,
+            )
         )
-        self.db.add(log)
-        await self.db.commit()
+
+    async def _generate(self, raw_command: str) -> GeneratedCommand | str:
+        """자연어 명령을 kubectl 명령어로 변환 (DB 접근 없음).
+
+        Returns:
+            GeneratedCommand | str: 생성 결과 또는 실패 시 에러 메시지
+        """
+        # 이미 kubectl 명령을 입력한 경우 정규화/패턴 매칭/LLM을 모두 건너뜀
+        passthrough = kubectl_passthrough(raw_command)
+        if passthrough is not None:
+            return passthrough
+
+        normalized = self.router.normalize_command(raw_command)
+
+        generated = await self.pattern_system.process_command(normalized)
+
+        if isinstance(generated, str):
+            return generated
+
+        if not generated.command.startswith("kubectl "):
+            return "kubectl # UNABLE_TO_GENERATE"
+
+        return generated
 
     async def execute_command(
         self,
@@ -141,45 +115,33 @@ class ExecutorService:
         raw_command: str,
         session_id: UUID | None,
     ) -> GeneratedCommand:
-        """자연어 명령을 받아 kubectl 명령어를 생성하고, 요청 로그를 남긴 뒤 결과 객체를 반환."""
-        normalized = self.router.normalize_command(raw_command)
+        """자연어 명령을 받아 kubectl 명령어를 생성하고, 요청 로그를 남긴 뒤 결과 객체를 반환.
 
-        generated = self.pattern_system.process_command(normalized)
+        로그(및 LLM 호출 시 usage 로그)는 log_buffer에 넣어 배치로 INSERT 되므로 응답 지연에서 제외된다.
+        """
+        generated = await self._generate(raw_command)
 
         if isinstance(generated, str):
-            await self._log_request(
-                raw_command=raw_command,
-                session_id=session_id,
-                generated_command=None,
-                is_success=False,
-                error_message=generated,
+            await log_buffer.submit(
+                make_log_row(
+                    raw_command=raw_command,
+                    session_id=session_id,
+                    executed_command=None,
+                    is_success=False,
+                    error_message=generated,
+                )
             )
             raise AppException(message=generated)
 
-        if not generated.command.startswith("kubectl "):
-            await self._log_request(
+        # usage는 LLM을 호출한 경우에만 존재
+        await log_buffer.submit(
+            make_log_row(
                 raw_command=raw_command,
                 session_id=session_id,
-                generated_command=None,
-                is_success=False,
-                error_message="kubectl # UNABLE_TO_GENERATE",
+                executed_command=generated.command,
+                is_success=True,
+                error_message=None,
+                usages=generated.usages,
             )
-            raise AppException(message="kubectl # UNABLE_TO_GENERATE")
-
-        request_log_id = await self._log_request(
-            raw_command=raw_command,
-            session_id=session_id,
-            generated_command=generated.command,
-            is_success=True,
-            error_message=None,
         )
-
-        # Log API usage if available (only when LLM was called)
-        if generated.usage is not None:
-            await self._log_usage(
-                usage=generated.usage,
-                session_id=session_id,
-                request_log_id=request_log_id,
-            )
-
         return generated
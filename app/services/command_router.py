@@ -1,4 +1,39 @@
 import re
+from functools import lru_cache
+from typing import NamedTuple
+
+# 한국어 불용어/종결어미(문장 끝)와 조사(단어 단위) 패턴 (모듈 로드 시 1회 컴파일).
+# 종결어미를 지운 뒤에야 조사가 독립된 단어가 되는 경우가 있으므로 ("pod 이좀"의 "이")
+# 두 패턴은 하나로 합치지 않고 종결어미 → 조사 순서로 적용한다.
+_ENDINGS_RE = re.compile(r"(?:부탁해|봐줘|보여줘|확인해줘|알려줘|줄래|볼래|주세요|해봐|줘|좀)\s*$")
+_PARTICLE_RE = re.compile(r"\b(?:을|를|이|가|은|는|에|에서|으로|로|와|과|도|만|까지|부터)\b")
+
+# 반복되는 명령이 많으므로 정규화 결과를 LRU로 캐싱 (순수 함수)
+_NORMALIZE_CACHE_SIZE = 4096
+
+
+class NormalizeCacheInfo(NamedTuple):
+    """Hit/miss statistics of the normalize_command cache."""
+
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+@lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
+def _normalize(raw_command: str) -> str:
+    # 앞뒤 공백 제거, 소문자 변환 후 불용어/종결어미, 조사 순서로 제거
+    normalized_command = _ENDINGS_RE.sub("", raw_command.strip().lower())
+    normalized_command = _PARTICLE_RE.sub("", normalized_command)
+
+    # 연속된 공백을 단일 공백으로 치환 + 앞뒤 공백 제거 (str.split은 C 루프 한 번)
+    return " ".join(normalized_command.split())
+
+
+def normalize_cache_info() -> NormalizeCacheInfo:
+    """Return hit/miss statistics of the normalize_command cache."""
+    return NormalizeCacheInfo(*_normalize.cache_info())
 
 
 class CommandRouter:
@@ -12,23 +47,7 @@ class CommandRouter:
             str: a normalized command
         """
 
-        # 앞뒤 공백 제거, 소문자 변환
-        normalized_command = raw_command.strip().lower()
-
-        # 한국어 불용어/종결어미, 조사 제거
-        endings = re.compile(
-            r"(부탁해|봐줘|보여줘|확인해줘|알려줘|줄래|볼래|주세요|해봐|줘|좀)\s*$"
-        )
-        particle = re.compile(r"\b(을|를|이|가|은|는|에|에서|으로|로|와|과|도|만|까지|부터)\b")
-
-        normalized_command = endings.sub("", normalized_command)
-        normalized_command = particle.sub("", normalized_command)
-
-        #  연속된 공백을 단일 공백으로 치환
-        normalized_command = re.sub(r"\s+", " ", normalized_command)
-
-        # 앞뒤 공백 제거 후 반환
-        return normalized_command.strip()
+        return _normalize(raw_command)
 
     def tokenize_command(self, normalized_command: str) -> list[str]:
         """Tokenize normalized command by space
@@ -39,4 +58,4 @@ class CommandRouter:
             list: a list of tokens
         """
 
-        return normalized_command.split(" ")
+        return normalized_command.split()
@@ -1,12 +1,408 @@
 from __future__ import annotations
 
-from openai import OpenAI
-from openai.types.responses import ParsedResponse
-from pydantic import BaseModel
+import asyncio
+import contextlib
+import hashlib
+import logging
+import operator
+import random
+import re
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import replace
+from functools import partial
+from typing import TYPE_CHECKING, Any, Final, TypeVar
+
+import httpx
+import orjson
+from cachetools import TTLCache
+from openai import (
+    APIConnectionError,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    InternalServerError,
+    RateLimitError,
+    omit,
+)
+from openai.types.responses import (
+    ParsedResponse,
+    Response,
+    ResponseFormatTextConfigParam,
+    ResponseTextConfigParam,
+)
+from pydantic import BaseModel, ConfigDict
 
 from app.core.config import settings
+from app.services.log_buffer import write_usage_log
 from app.services.types import GeneratedCommand, UsageInfo
 
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+    from app.services.semantic_cache import SemanticCache
+
+logger = logging.getLogger(__name__)
+
+# 연결/풀 대기는 짧게, 읽기(모델 생성 대기)는 OPENAI_TIMEOUT까지 허용
+_TIMEOUT = httpx.Timeout(
+    settings.OPENAI_TIMEOUT,
+    connect=settings.OPENAI_CONNECT_TIMEOUT,
+    write=5.0,
+    pool=settings.OPENAI_POOL_TIMEOUT,
+)
+
+# 프로세스 전체에서 공유하는 OpenAI 클라이언트 (하나의 httpx 커넥션 풀 / keep-alive / HTTP/2)
+_shared_client: AsyncOpenAI | None = None
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Get the process-wide AsyncOpenAI client, creating it on first use.
+
+    await 없이 생성하므로 이벤트 루프 안에서 별도 lock 없이도 한 번만 만들어진다.
+    """
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            timeout=_TIMEOUT,
+            # 재시도는 _call_with_retries가 담당 (semaphore 밖에서 backoff + 지표 집계)
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY,
+                ),
+                timeout=_TIMEOUT,
+                http2=settings.OPENAI_HTTP2,
+            ),
+        )
+    return _shared_client
+
+
+T = TypeVar("T")
+
+# 프로세스 전체에서 동시에 진행되는 LLM 호출 수 상한 (provider RPM/TPM 보호)
+_llm_semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+
+# LLM 호출 지표 (프로세스 단위): 진행 중 호출 수, 재시도 횟수, 429 응답 수
+_llm_metrics = {"in_flight": 0, "retries": 0, "rate_limited": 0}
+
+# 재시도할 오류: 429, 연결 오류/타임아웃, 5xx
+_RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+_RETRY_BASE_DELAY = 0.5  # 초, 시도마다 2배 + 최대 0.2초 jitter
+
+
+def llm_call_metrics() -> dict[str, int]:
+    """Return a snapshot of the process-wide LLM call metrics."""
+    return dict(_llm_metrics)
+
+
+@contextlib.asynccontextmanager
+async def _llm_slot() -> AsyncIterator[None]:
+    """동시 호출 수 제한 슬롯 하나를 잡고 진행 중 호출 수를 집계."""
+    async with _llm_semaphore:
+        _llm_metrics["in_flight"] += 1
+        try:
+            yield
+        finally:
+            _llm_metrics["in_flight"] -= 1
+
+
+async def _call_with_retries(call: Callable[[], Awaitable[T]]) -> T:
+    """슬롯 안에서 호출하고, 재시도 가능한 오류면 슬롯을 놓은 채 지수 backoff 후 재시도."""
+    attempt = 0
+    while True:
+        try:
+            async with _llm_slot():
+                return await call()
+        except _RETRYABLE_ERRORS as e:
+            if isinstance(e, RateLimitError):
+                _llm_metrics["rate_limited"] += 1
+            if attempt >= settings.OPENAI_MAX_RETRIES:
+                raise
+            _llm_metrics["retries"] += 1
+            await asyncio.sleep(_RETRY_BASE_DELAY * 2**attempt + random.random() * 0.2)
+            attempt += 1
+
+
+async def close_openai_client() -> None:
+    """Close the process-wide AsyncOpenAI client (and its connection pool), if it was created."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.close()
+        _shared_client = None
+
+
+# (모델, 정규화된 명령) → 생성 결과 (성공한 결과만 저장). 같은 요청이 반복되면 LLM 호출을 건너뛴다.
+# 모델/프롬프트 변경이 오래 남지 않도록 TTL을 둔 LRU
+_response_cache: TTLCache[str, GeneratedCommand] = TTLCache(
+    maxsize=settings.LLM_CACHE_MAX_SIZE, ttl=settings.LLM_CACHE_TTL
+)
+
+
+def _canonical_command(command: str) -> str:
+    """대소문자/연속 공백 차이를 무시한 명령 문자열 (템플릿/임베딩 입력으로도 사용)."""
+    return " ".join(command.casefold().split())
+
+
+def _is_comment_command(kubectl_cmd: str) -> bool:
+    """실행할 명령 없이 '#' 주석만 있는 kubectl 명령 (kubectl # UNABLE_TO_GENERATE 등)."""
+    return kubectl_cmd.removeprefix("kubectl").lstrip().startswith("#")
+
+
+def _cache_key(model: str, canonical_command: str) -> str:
+    """캐시 키: 모델 + 명령의 SHA-256 (입력 길이와 무관하게 고정 길이)."""
+    return hashlib.sha256(f"{model}\x00{canonical_command}".encode()).hexdigest()
+
+
+# 생성 실패 결과(에러 메시지)는 짧은 TTL로만 보관 (일시적 장애가 오래 남지 않도록)
+_error_cache: TTLCache[str, str] = TTLCache(
+    maxsize=settings.LLM_ERROR_CACHE_MAX_SIZE, ttl=settings.LLM_ERROR_CACHE_TTL
+)
+
+
+# provider prompt cache 적중률 확인용 누적 토큰 수 (프로세스 단위, 종료 시 로그)
+_prompt_tokens = {"input": 0, "cached": 0}
+
+
+def prompt_cache_info() -> tuple[int, int]:
+    """Return (cached_tokens, input_tokens) accumulated over all LLM calls in this process."""
+    return _prompt_tokens["cached"], _prompt_tokens["input"]
+
+
+def clear_cache() -> None:
+    """LLM 응답 캐시(성공/실패) 비우기."""
+    _response_cache.clear()
+    _error_cache.clear()
+
+
+def _canonical_prompt(text: str) -> str:
+    """줄 끝 공백 제거 등으로 prompt를 정규화 (prefix가 요청 간 바이트 단위로 같아야 캐시 적중)."""
+    return "\n".join(line.rstrip() for line in text.strip().splitlines())
+
+
+# Responses API instructions (system 프롬프트) 원문. OPENAI_FULL_SYSTEM_PROMPT=true일 때 사용 (A/B 비교용)
+_SYSTEM_PROMPT_FULL: Final[str] = _canonical_prompt(
+    "You are an expert Kubernetes operator and kubectl command generator\n\n"
+    "# ROLE\n"
+    "Convert natural language requests (Korean or English) into precise kubectl commands.\n\n"
+    "# INPUT FORMAT\n"
+    "Users will provide requests, which may include:\n"
+    "- Resource types: 파드/pod, 서비스/service, 디플로이먼트/deployment, 네임스페이스/namespace\n"
+    "- Actions: 조회/list/get, 삭제/delete, 생성/create, 수정/edit, 로그/logs\n"
+    "- Filters: 네임스페이스 이름, 레이블, 리소스 이름\n"
+    "- Modifiers: 모든/all, 상세/detailed, 실시간/watch\n\n"
+    "# OUTPUT REQUIREMENTS\n"
+    "Generate a structured response with three fields:\n"
+    "1. **command**: A single, executable kubectl command (no explanations, no markdown)\n"
+    "2. **reason**: Brief explanation in Korean of what the command does (1-2 sentences)\n"
+    "3. **title**: Concise English summary (3-5 words)\n\n"
+    "# KUBECTL COMMAND RULES\n"
+    "## Safety First\n"
+    "- Default to READ-ONLY operations (get, describe, logs) when intent is unclear\n"
+    "- NEVER generate destructive commands (delete, drain, cordon) unless explicitly requested\n"
+    "- For ambiguous requests, prefer the safest interpretation\n\n"
+    "## Namespace Handling\n"
+    "- '모든 네임스페이스' / '전체 네임스페이스' / 'all namespaces' → use `-A` or `--all-namespaces`\n"
+    "- Specific namespace mentioned (e.g., 'default', 'kube-system') → use `-n <namespace>`\n"
+    "- No namespace mentioned → omit namespace flag (uses current context)\n\n"
+    "## Resource Selection\n"
+    "- App/service name mentioned → use label selector: `-l app=<name>`\n"
+    "- Specific resource name → use direct reference: `<resource-type> <name>`\n"
+    "- '모든' / 'all' / '전체' without resource name → list all of that type\n\n"
+    "## Common Patterns\n"
+    "- List pods: `kubectl get pods [-n <ns>] [-A] [-l app=<name>]`\n"
+    "- Pod logs: `kubectl logs [-f] [-n <ns>] <pod-name> [-c <container>]` (add -f for '실시간')\n"
+    "- Describe resource: `kubectl describe <type> <name> [-n <ns>]`\n"
+    "- Watch resources: `kubectl get <type> [-w] [-A]` (add -w for '실시간' / 'watch')\n"
+    "- Service details: `kubectl get svc <name> [-n <ns>] [-o wide]` or `kubectl describe svc <name>`\n\n"
+    "## Output Formatting\n"
+    "- Add `-o wide` for more details when user asks for '상세' / 'detailed' / '자세히'\n"
+    "- Add `-o yaml` or `-o json` when user explicitly asks for YAML/JSON format\n"
+    "- Default to table output (no -o flag) for simple listings\n\n"
+    "## Korean Keyword Mappings\n"
+    "- 조회/목록/리스트/보기/확인 → get\n"
+    "- 로그/기록 → logs\n"
+    "- 상세/자세히/설명 → describe\n"
+    "- 실시간/지켜보기 → -f (for logs) or -w (for get)\n"
+    "- 파드/팟 → pod/pods\n"
+    "- 서비스 → service/svc\n"
+    "- 디플로이먼트/배포 → deployment/deploy\n"
+    "- 노드 → node\n"
+    "- 네임스페이스/ns → namespace\n\n"
+    "# EXAMPLES\n"
+    "Input: '모든 파드 목록 보여줘'\n"
+    "Output: {command: 'kubectl get pods -A', reason: '전체 네임스페이스의 모든 파드 목록 조회', title: 'List all pods'}\n\n"
+    "Input: 'default 네임스페이스의 nginx 서비스 상태 확인'\n"
+    "Output: {command: 'kubectl get svc nginx -n default', reason: 'default 네임스페이스의 nginx 서비스 상태 조회', title: 'Get nginx service'}\n\n"
+    "Input: 'api 파드 로그 실시간으로'\n"
+    "Output: {command: 'kubectl logs -f api', reason: 'api 파드의 로그를 실시간으로 출력', title: 'Stream api pod logs'}\n\n"
+    "# ERROR HANDLING\n"
+    "If the request is truly impossible to convert to kubectl (e.g., unrelated to Kubernetes):\n"
+    "- Set command to: 'kubectl # UNABLE_TO_GENERATE'\n"
+    "- Explain why in the reason field\n"
+    "- Set title to: 'Unable to generate'\n\n"
+    "# FINAL REMINDER\n"
+    "- Generate ONLY valid kubectl commands that can be executed directly\n"
+    "- Be conservative: when in doubt, use read-only commands\n"
+    "- Always fill all three fields: command, reason, title"
+)
+
+
+# 기본 system 프롬프트: 원문에서 중복 설명/형식 문구를 걷어낸 압축본 (규칙, 매핑, 예시는 유지)
+_SYSTEM_PROMPT: Final[str] = _canonical_prompt(
+    "Convert Korean/English Kubernetes requests into one executable kubectl command.\n"
+    "Fields: command (kubectl only, no markdown), reason (Korean, 1-2 sentences), "
+    "title (English, 3-5 words).\n"
+    "Rules:\n"
+    "- Prefer read-only (get/describe/logs); delete/drain/cordon only if explicitly asked\n"
+    "- 모든/전체 네임스페이스, all namespaces → -A; named namespace → -n <ns>; none → no flag\n"
+    "- app/service name → -l app=<name>; specific resource → <type> <name>\n"
+    "- 상세/자세히/detailed → -o wide; YAML/JSON asked → -o yaml|json\n"
+    "- 실시간/watch → -f for logs, -w for get\n"
+    "- logs: kubectl logs [-f] [-n <ns>] <pod> [-c <container>]\n"
+    "Terms: 조회/목록/리스트/보기/확인=get, 로그/기록=logs, 상세/자세히/설명=describe, "
+    "파드/팟=pods, 서비스=svc, 디플로이먼트/배포=deploy, 노드=node, 네임스페이스/ns=namespace\n"
+    "Examples:\n"
+    "'모든 파드 목록 보여줘' → kubectl get pods -A | 전체 네임스페이스의 모든 파드 목록 조회 | "
+    "List all pods\n"
+    "'default 네임스페이스의 nginx 서비스 상태 확인' → kubectl get svc nginx -n default | "
+    "default 네임스페이스의 nginx 서비스 상태 조회 | Get nginx service\n"
+    "'api 파드 로그 실시간으로' → kubectl logs -f api | api 파드의 로그를 실시간으로 출력 | "
+    "Stream api pod logs\n"
+    "Not about Kubernetes → command 'kubectl # UNABLE_TO_GENERATE', why in reason, "
+    "title 'Unable to generate'"
+)
+
+# 응답에서 "kubectl ..." 로 시작하는 첫 줄 (앞 공백 허용, 백틱/줄바꿈 전까지)
+_KUBECTL_LINE_RE = re.compile(r"(?m)^\s*(kubectl\s+[^\n`]+)")
+
+# usage에서 필요한 필드를 C 레벨에서 한 번에 꺼내는 getter
+_USAGE_GETTER = operator.attrgetter("input_tokens", "output_tokens", "input_tokens_details")
+
+# 스트리밍 중 누적된 structured output JSON에서 (스키마 순서상 첫 필드인) command 값이 닫혔는지 확인
+_COMMAND_FIELD_RE = re.compile(r'^\s*\{\s*"command"\s*:\s*("(?:[^"\\]|\\.)*")')
+
+# 조기 반환 후 스트림 나머지를 처리하는 태스크 (GC 방지용 참조)
+_background_tasks: set[asyncio.Task[None]] = set()
+
+# 사용자 입력 앞부분도 고정 문자열로 두어 요청 간 prefix를 동일하게 유지
+_USER_PREFIX: Final[str] = "다음 요청을 하나의 kubectl 명령어로 변환해 주세요.\n요청: "
+
+# 로컬 템플릿: 자주 쓰는 단순 문형은 LLM 호출 없이 바로 kubectl 명령으로 변환
+# (정규화된 명령 전체가 일치할 때만 사용, 모듈 로드 시 1회 컴파일)
+_RESOURCES: Final[dict[str, str]] = {
+    "파드": "pods",
+    "pod": "pods",
+    "pods": "pods",
+    "서비스": "services",
+    "service": "services",
+    "services": "services",
+    "svc": "services",
+    "디플로이먼트": "deployments",
+    "deployment": "deployments",
+    "deployments": "deployments",
+    "노드": "nodes",
+    "node": "nodes",
+    "nodes": "nodes",
+    "네임스페이스": "namespaces",
+    "namespace": "namespaces",
+    "namespaces": "namespaces",
+    "이벤트": "events",
+    "event": "events",
+    "events": "events",
+    "컨피그맵": "configmaps",
+    "configmap": "configmaps",
+    "configmaps": "configmaps",
+    "인그레스": "ingresses",
+    "ingress": "ingresses",
+    "pvc": "pvc",
+}
+# -A가 의미 없는 클러스터 범위 리소스
+_CLUSTER_SCOPED: Final[frozenset[str]] = frozenset({"nodes", "namespaces"})
+
+_RES = "(?P<res>" + "|".join(sorted(map(re.escape, _RESOURCES), key=len, reverse=True)) + ")"
+_NAME = r"[a-z0-9](?:[a-z0-9.-]*[a-z0-9])?"
+_NS = rf"(?P<ns>{_NAME})\s*(?:네임스페이스(?:의)?|ns|의)\s+"
+# 리소스/로그를 가리키는 단어 자체는 파드 이름이 아니다 ("pod 로그" → kubectl logs pod 방지)
+_RESOURCE_WORDS = (*(word for word in _RESOURCES if word.isascii()), "log", "logs")
+_NOT_RESOURCE_WORD = rf"(?!(?:{'|'.join(_RESOURCE_WORDS)})(?![a-z0-9.-]))"
+
+
+def _all_namespaces(resource: str) -> str:
+    return "" if resource in _CLUSTER_SCOPED else " -A"
+
+
+def _namespace(match: re.Match[str]) -> str:
+    ns = match["ns"]
+    return f" -n {ns}" if ns else ""
+
+
+def _list_all(m: re.Match[str]) -> tuple[str, str]:
+    resource = _RESOURCES[m["res"]]
+    return f"kubectl get {resource}{_all_namespaces(resource)}", f"List all {resource}"
+
+
+def _list_in_namespace(m: re.Match[str]) -> tuple[str, str]:
+    resource = _RESOURCES[m["res"]]
+    return f"kubectl get {resource}{_namespace(m)}", f"List {resource} in {m['ns']}"
+
+
+def _pod_logs(m: re.Match[str]) -> tuple[str, str]:
+    return f"kubectl logs {m['pod']}{_namespace(m)}", f"Show {m['pod']} pod logs"
+
+
+def _describe(m: re.Match[str]) -> tuple[str, str]:
+    resource = _RESOURCES[m["res"]]
+    return (
+        f"kubectl describe {resource} {m['name']}{_namespace(m)}",
+        f"Describe {resource} {m['name']}",
+    )
+
+
+def _list_by_app(m: re.Match[str]) -> tuple[str, str]:
+    resource = _RESOURCES[m["res"]]
+    return f"kubectl get {resource} -l app={m['app']}", f"List {resource} for {m['app']}"
+
+
+# (패턴, match → (kubectl 명령, 3-5 단어 영어 title))
+_LOCAL_TEMPLATES: Final[
+    tuple[tuple[re.Pattern[str], Callable[[re.Match[str]], tuple[str, str]]], ...]
+] = (
+    # 모든 파드 / 전체 서비스 목록
+    (re.compile(rf"(?:모든|전체)\s+{_RES}(?:\s+목록)?"), _list_all),
+    # <ns> 네임스페이스 파드 / <ns>의 서비스
+    (re.compile(rf"{_NS}{_RES}(?:\s+목록)?"), _list_in_namespace),
+    # [<ns>의] [파드] <pod> 로그
+    (
+        re.compile(
+            rf"(?:{_NS})?(?:파드\s+|pod\s+)?(?P<pod>{_NOT_RESOURCE_WORD}{_NAME})"
+            r"\s*(?:의\s*)?(?:로그|logs?)"
+        ),
+        _pod_logs,
+    ),
+    # <resource> <name> 상세 / describe
+    (
+        re.compile(
+            rf"(?:{_NS})?{_RES}\s+(?P<name>{_NAME})\s*(?:의\s*)?(?:상세(?:\s*정보)?|describe)"
+        ),
+        _describe,
+    ),
+    # app=<label> 파드 / 앱 <label> 파드
+    (re.compile(rf"(?:app\s*=\s*|앱\s+)(?P<app>{_NAME})\s*(?:의\s+)?{_RES}"), _list_by_app),
+)
+
+
+def _match_local_template(command: str) -> GeneratedCommand | None:
+    """로컬 템플릿과 전체가 일치하면 해당 kubectl 명령 반환."""
+    for pattern, build in _LOCAL_TEMPLATES:
+        match = pattern.fullmatch(command)
+        if match is not None:
+            kubectl_cmd, title = build(match)
+            return GeneratedCommand(command=kubectl_cmd, reason="로컬 템플릿 매칭", title=title)
+    return None
+
 
 class KubectlStructuredOutput(BaseModel):
     """Responses API structured output 모델."""
@@ -14,114 +410,79 @@ class KubectlStructuredOutput(BaseModel):
     command: str
     reason: str
     title: str
-    model_config = {"extra": "forbid"}
+    # 파싱 후 읽기만 하므로 불변 모델로 둔다
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+
+# structured output strict 스키마 (import 시 1회 생성).
+# parse(text_format=...)는 호출마다 pydantic 스키마를 다시 만들므로 create()에 이 값을 직접 넘기고
+# 응답 JSON은 KubectlStructuredOutput.model_validate_json으로 직접 검증한다.
+_STRICT_FORMAT: Final[ResponseFormatTextConfigParam] = {
+    "type": "json_schema",
+    "strict": True,
+    "name": KubectlStructuredOutput.__name__,
+    "schema": KubectlStructuredOutput.model_json_schema(),
+}
 
 
 class ComplexCommandProcessor:
     """단순 패턴 매칭에 실패한 자연어 명령어를 LLM을 활용해 kubectl 명령어로 변환하는 프로세서."""
 
-    def __init__(self, client: OpenAI | None = None) -> None:
-        api_key = settings.OPENAI_API_KEY
-        self.client = client or OpenAI(api_key=api_key)
+    def __init__(
+        self,
+        client: AsyncOpenAI | None = None,
+        semantic_cache: SemanticCache | None = None,
+    ) -> None:
+        self.client = client or get_openai_client()
         self.model = settings.OPENAI_MODEL
-        self.timeout = settings.OPENAI_TIMEOUT
-        self.max_output_tokens = 1024
+        self.fallback_model = settings.OPENAI_FALLBACK_MODEL
+        self.timeout = _TIMEOUT
+        # 출력은 kubectl 한 줄 + 짧은 설명 두 필드라 짧게 제한 (incomplete 시 2배로 한 번 재시도)
+        self.max_output_tokens = settings.OPENAI_MAX_OUTPUT_TOKENS
+        self.reasoning_effort = settings.OPENAI_REASONING_EFFORT
+        self.verbosity = settings.OPENAI_VERBOSITY
+        self.stream_early_exit = settings.OPENAI_STREAM_EARLY_EXIT
+        self.system_prompt = (
+            _SYSTEM_PROMPT_FULL if settings.OPENAI_FULL_SYSTEM_PROMPT else _SYSTEM_PROMPT
+        )
+        self.prompt_cache_key = settings.OPENAI_PROMPT_CACHE_KEY
+        # 요청 간 변하지 않는 text 설정 (create()는 전달한 dict를 변경하지 않으므로 공유)
+        self.text_config: ResponseTextConfigParam = {"format": _STRICT_FORMAT}
+        if self.verbosity:
+            self.text_config["verbosity"] = self.verbosity
+
+        # 의미가 같은 다른 표현까지 재사용하는 임베딩 캐시 (선택, numpy 필요)
+        if semantic_cache is None and settings.SEMANTIC_CACHE_ENABLED:
+            from app.services.semantic_cache import SemanticCache
+
+            semantic_cache = SemanticCache(
+                self.client,
+                model=settings.SEMANTIC_CACHE_MODEL,
+                threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+                max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+                timeout=self.timeout,
+            )
+        self.semantic_cache = semantic_cache
 
     def _build_system_prompt(self) -> str:
-        """system 프롬프트 정의"""
-        return (
-            "You are an expert Kubernetes operator and kubectl command generator\n\n"
-            "# ROLE\n"
-            "Convert natural language requests (Korean or English) into precise kubectl commands.\n\n"
-            "# INPUT FORMAT\n"
-            "Users will provide requests, which may include:\n"
-            "- Resource types: 파드/pod, 서비스/service, 디플로이먼트/deployment, 네임스페이스/namespace\n"
-            "- Actions: 조회/list/get, 삭제/delete, 생성/create, 수정/edit, 로그/logs\n"
-            "- Filters: 네임스페이스 이름, 레이블, 리소스 이름\n"
-            "- Modifiers: 모든/all, 상세/detailed, 실시간/watch\n\n"
-            "# OUTPUT REQUIREMENTS\n"
-            "Generate a structured response with three fields:\n"
-            "1. **command**: A single, executable kubectl command (no explanations, no markdown)\n"
-            "2. **reason**: Brief explanation in Korean of what the command does (1-2 sentences)\n"
-            "3. **title**: Concise English summary (3-5 words)\n\n"
-            "# KUBECTL COMMAND RULES\n"
-            "## Safety First\n"
-            "- Default to READ-ONLY operations (get, describe, logs) when intent is unclear\n"
-            "- NEVER generate destructive commands (delete, drain, cordon) unless explicitly requested\n"
-            "- For ambiguous requests, prefer the safest interpretation\n\n"
-            "## Namespace Handling\n"
-            "- '모든 네임스페이스' / '전체 네임스페이스' / 'all namespaces' → use `-A` or `--all-namespaces`\n"
-            "- Specific namespace mentioned (e.g., 'default', 'kube-system') → use `-n <namespace>`\n"
-            "- No namespace mentioned → omit namespace flag (uses current context)\n\n"
-            "## Resource Selection\n"
-            "- App/service name mentioned → use label selector: `-l app=<name>`\n"
-            "- Specific resource name → use direct reference: `<resource-type> <name>`\n"
-            "- '모든' / 'all' / '전체' without resource name → list all of that type\n\n"
-            "## Common Patterns\n"
-            "- List pods: `kubectl get pods [-n <ns>] [-A] [-l app=<name>]`\n"
-            "- Pod logs: `kubectl logs [-f] [-n <ns>] <pod-name> [-c <container>]` (add -f for '실시간')\n"
-            "- Describe resource: `kubectl describe <type> <name> [-n <ns>]`\n"
-            "- Watch resources: `kubectl get <type> [-w] [-A]` (add -w for '실시간' / 'watch')\n"
-            "- Service details: `kubectl get svc <name> [-n <ns>] [-o wide]` or `kubectl describe svc <name>`\n\n"
-            "## Output Formatting\n"
-            "- Add `-o wide` for more details when user asks for '상세' / 'detailed' / '자세히'\n"
-            "- Add `-o yaml` or `-o json` when user explicitly asks for YAML/JSON format\n"
-            "- Default to table output (no -o flag) for simple listings\n\n"
-            "## Korean Keyword Mappings\n"
-            "- 조회/목록/리스트/보기/확인 → get\n"
-            "- 로그/기록 → logs\n"
-            "- 상세/자세히/설명 → describe\n"
-            "- 실시간/지켜보기 → -f (for logs) or -w (for get)\n"
-            "- 파드/팟 → pod/pods\n"
-            "- 서비스 → service/svc\n"
-            "- 디플로이먼트/배포 → deployment/deploy\n"
-            "- 노드 → node\n"
-            "- 네임스페이스/ns → namespace\n\n"
-            "# EXAMPLES\n"
-            "Input: '모든 파드 목록 보여줘'\n"
-            "Output: {command: 'kubectl get pods -A', reason: '전체 네임스페이스의 모든 파드 목록 조회', title: 'List all pods'}\n\n"
-            "Input: 'default 네임스페이스의 nginx 서비스 상태 확인'\n"
-            "Output: {command: 'kubectl get svc nginx -n default', reason: 'default 네임스페이스의 nginx 서비스 상태 조회', title: 'Get nginx service'}\n\n"
-            "Input: 'api 파드 로그 실시간으로'\n"
-            "Output: {command: 'kubectl logs -f api', reason: 'api 파드의 로그를 실시간으로 출력', title: 'Stream api pod logs'}\n\n"
-            "# ERROR HANDLING\n"
-            "If the request is truly impossible to convert to kubectl (e.g., unrelated to Kubernetes):\n"
-            "- Set command to: 'kubectl # UNABLE_TO_GENERATE'\n"
-            "- Explain why in the reason field\n"
-            "- Set title to: 'Unable to generate'\n\n"
-            "# FINAL REMINDER\n"
-            "- Generate ONLY valid kubectl commands that can be executed directly\n"
-            "- Be conservative: when in doubt, use read-only commands\n"
-            "- Always fill all three fields: command, reason, title"
-        )
+        """system 프롬프트 반환 (모듈 상수: 매 호출 바이트 단위로 동일해야 provider prompt cache가 적중)"""
+        return self.system_prompt
 
     def _extract_kubectl_command(self, raw: str) -> str:
-        """모델 응답에서 실제 kubectl 한 줄 추출."""
-        text = raw.strip()
-
-        if "```" in text:
-            parts = text.split("```")
-            if len(parts) >= 2:
-                text = parts[1].strip()
-
-        for line in text.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            if line.startswith("kubectl "):
-                return line
-
-        if text.startswith("kubectl "):
-            return text
+        """모델 응답에서 실제 kubectl 한 줄 추출 (코드 펜스 안이든 밖이든 첫 kubectl 줄)."""
+        match = _KUBECTL_LINE_RE.search(raw)
+        return match.group(1).strip() if match else raw.strip()
 
-        return text
+    def _response_key(self, canonical_command: str) -> str:
+        """응답 캐시 키. 조회는 항상 기본 모델 기준이므로 상위 모델이 만든 결과도 이 키로 저장한다."""
+        return _cache_key(self.model, canonical_command)
 
     def _build_user_input(self, command: str) -> str:
         """사용자 입력 콘텐츠 생성."""
-        return f"다음 요청을 하나의 kubectl 명령어로 변환해 주세요.\n요청: {command}"
+        return _USER_PREFIX + command
 
     def _extract_structured_payload(
-        self, response: object
+        self, response: Response
     ) -> tuple[KubectlStructuredOutput | str | None, bool]:
         """
         Responses API 결과에서 Structured Output을 추출.
@@ -130,66 +491,203 @@ class ComplexCommandProcessor:
             payload: KubectlStructuredOutput | str | None - 파싱된 모델 또는 거절 메시지
             refused: bool - 거절 여부
         """
-        parsed = getattr(response, "output_parsed", None)
-        if parsed:
-            return parsed, False
-
-        output_items = getattr(response, "output", None) or []
-        for item in output_items:
-            contents = getattr(item, "content", None) or []
-            for content in contents:
-                if getattr(content, "type", None) == "refusal":
-                    return (
-                        f"kubectl # REFUSED: {getattr(content, 'refusal', 'Unknown reason')}",
-                        True,
-                    )
+        for item in response.output:
+            if item.type != "message":
+                continue
+            for content in item.content:
+                if content.type == "refusal":
+                    return f"kubectl # REFUSED: {content.refusal or 'Unknown reason'}", True
+                if content.type == "output_text" and content.text:
+                    return KubectlStructuredOutput.model_validate_json(content.text), False
 
         return None, False
 
-    def _call_responses(
-        self, command: str
+    def _incomplete_reason(self, resp: Response) -> str | None:
+        """응답이 incomplete 상태면 그 사유, 아니면 None."""
+        if resp.status != "incomplete":
+            return None
+        details = resp.incomplete_details
+        return (details.reason if details else None) or "unknown"
+
+    def _extract_usage(self, resp: Response, model: str) -> UsageInfo | None:
+        """Responses API 결과에서 토큰 사용량 추출."""
+        if resp.usage is None:
+            return None
+        try:
+            input_tokens, output_tokens, details = _USAGE_GETTER(resp.usage)
+        except AttributeError:
+            return None
+        cached_tokens = (getattr(details, "cached_tokens", 0) or 0) if details else 0
+        _prompt_tokens["input"] += input_tokens or 0
+        _prompt_tokens["cached"] += cached_tokens
+        return UsageInfo(
+            model=model,
+            input_tokens=input_tokens or 0,
+            output_tokens=output_tokens or 0,
+            cached_tokens=cached_tokens,
+        )
+
+    async def _stream_response(
+        self,
+        command: str,
+        model: str,
+        command_ready: asyncio.Future[str],
+    ) -> ParsedResponse[None]:
+        """스트리밍으로 호출하고, command 필드가 닫히는 즉시 command_ready에 값을 채움.
+
+        스트림은 끝까지 소비하고 최종 응답을 반환한다 (reason/title, usage 포함).
+        일반 호출과 같이 _call_with_retries로 동시 호출 수 제한과 재시도를 적용한다.
+        """
+        instructions = self._build_system_prompt()
+        user_input = self._build_user_input(command)
+
+        async def _attempt() -> ParsedResponse[None]:
+            async with self.client.responses.stream(
+                model=model,
+                instructions=instructions,
+                input=user_input,
+                max_output_tokens=self.max_output_tokens,
+                timeout=self.timeout,
+                reasoning={"effort": self.reasoning_effort} if self.reasoning_effort else omit,
+                text=self.text_config,
+                prompt_cache_key=self.prompt_cache_key or omit,
+            ) as stream:
+                text = ""
+                async for event in stream:
+                    # 재시도한 스트림이면 command는 이미 전달됐으므로 최종 응답만 받는다
+                    if event.type == "response.output_text.delta" and not command_ready.done():
+                        text += event.delta
+                        match = _COMMAND_FIELD_RE.match(text)
+                        if match:
+                            command_ready.set_result(orjson.loads(match.group(1)))
+                return await stream.get_final_response()
+
+        return await _call_with_retries(_attempt)
+
+    async def warmup(self) -> None:
+        """system 프롬프트 prefix를 provider prompt cache에 올려 두는 최소 호출.
+
+        실제 요청과 같은 instructions/스키마/prompt_cache_key로 보내야 같은 prefix가 캐싱된다.
+        """
+        try:
+            # 결과 JSON은 16토큰에서 잘리므로 검증하지 않는다
+            resp = await _call_with_retries(
+                partial(
+                    self.client.responses.create,
+                    model=self.model,
+                    instructions=self._build_system_prompt(),
+                    input=self._build_user_input("ping"),
+                    max_output_tokens=16,  # API 최소값, 결과는 사용하지 않음
+                    timeout=self.timeout,
+                    text=self.text_config,
+                    reasoning={"effort": self.reasoning_effort} if self.reasoning_effort else omit,
+                    prompt_cache_key=self.prompt_cache_key or omit,
+                )
+            )
+        except Exception as e:
+            logger.warning(f"LLM warmup failed: {e}", extra={"request_id": "llm-warmup"})
+            return
+
+        usage = self._extract_usage(resp, self.model)
+        if usage is not None:
+            await write_usage_log(usage)
+
+    async def _finish_stream(
+        self,
+        task: asyncio.Task[ParsedResponse[None]],
+        command: str,
+        model: str,
+        vector: npt.NDArray[np.float32] | None,
+    ) -> None:
+        """조기 반환한 스트림의 나머지를 받아 usage를 기록하고 전체 결과를 캐시에 저장.
+
+        조기 반환한 결과는 reason/title이 비어 있으므로 process()는 캐시하지 않는다.
+        """
+        try:
+            response = await task
+        except Exception as e:
+            logger.warning(f"Streamed LLM response failed: {e}", extra={"request_id": "N/A"})
+            return
+
+        usage = self._extract_usage(response, model)
+        if usage is not None:
+            await write_usage_log(usage)
+
+        try:
+            structured, _ = self._extract_structured_payload(response)
+        except ValueError as e:
+            logger.warning(f"Streamed LLM response is invalid: {e}", extra={"request_id": "N/A"})
+            return
+        generated = self._to_generated(structured)
+        if isinstance(generated, GeneratedCommand):
+            _response_cache[self._response_key(_canonical_command(command))] = generated
+            if self.semantic_cache is not None and vector is not None:
+                self.semantic_cache.add(vector, generated)
+
+    async def _call_responses(
+        self,
+        command: str,
+        model: str,
+        vector: npt.NDArray[np.float32] | None = None,
     ) -> tuple[KubectlStructuredOutput | None | str, UsageInfo | None]:
         """Responses API 호출을 수행하고 BaseModel로 파싱."""
         usage_info: UsageInfo | None = None
+        # 재시도 시에도 그대로 쓰도록 요청마다 한 번만 구성
+        instructions = self._build_system_prompt()
+        user_input = self._build_user_input(command)
 
-        def _invoke(
+        async def _invoke(
             max_tokens: int,
-        ) -> tuple[ParsedResponse[KubectlStructuredOutput], UsageInfo | None]:
-            resp = self.client.responses.parse(
-                model=self.model,
-                instructions=self._build_system_prompt(),
-                input=self._build_user_input(command),
-                max_output_tokens=max_tokens,
-                timeout=self.timeout,
-                text_format=KubectlStructuredOutput,
-            )
-            usage: UsageInfo | None = None
-            if hasattr(resp, "usage") and resp.usage:
-                u = resp.usage
-                cached_tokens = 0
-                if hasattr(u, "input_tokens_details") and u.input_tokens_details:
-                    cached_tokens = getattr(u.input_tokens_details, "cached_tokens", 0) or 0
-                usage = UsageInfo(
-                    input_tokens=getattr(u, "input_tokens", 0) or 0,
-                    output_tokens=getattr(u, "output_tokens", 0) or 0,
-                    cached_tokens=cached_tokens,
+        ) -> tuple[Response, UsageInfo | None]:
+            resp = await _call_with_retries(
+                partial(
+                    self.client.responses.create,
+                    model=model,
+                    instructions=instructions,
+                    input=user_input,
+                    max_output_tokens=max_tokens,
+                    timeout=self.timeout,
+                    # 빈 값이면 파라미터를 보내지 않음 (reasoning/verbosity 미지원 모델용).
+                    reasoning={"effort": self.reasoning_effort} if self.reasoning_effort else omit,
+                    text=self.text_config,
+                    # 같은 prefix의 요청을 같은 캐시 샤드로 라우팅 (cached_tokens는 usage 로그에 기록)
+                    prompt_cache_key=self.prompt_cache_key or omit,
                 )
-            return resp, usage
+            )
+            return resp, self._extract_usage(resp, model)
 
         try:
-            response, usage_info = _invoke(self.max_output_tokens)
-
-            if getattr(response, "status", None) == "incomplete":
-                details = getattr(response, "incomplete_details", None)
-                reason = getattr(details, "reason", "unknown")
-                if reason == "max_output_tokens":
-                    response, usage_info = _invoke(self.max_output_tokens * 2)
-                else:
-                    return f"kubectl # INCOMPLETE: {reason}", usage_info
-
-            if getattr(response, "status", None) == "incomplete":
-                details = getattr(response, "incomplete_details", None)
-                reason = getattr(details, "reason", "unknown")
+            response: Response
+            if self.stream_early_exit:
+                # command 필드만 받으면 바로 반환, 나머지(reason/title, usage)는 백그라운드에서 처리
+                command_ready: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+                task = asyncio.create_task(self._stream_response(command, model, command_ready))
+                waiters: set[asyncio.Future[Any]] = {command_ready, task}
+                await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+                if command_ready.done():
+                    finisher = asyncio.create_task(
+                        self._finish_stream(task, command, model, vector)
+                    )
+                    _background_tasks.add(finisher)
+                    finisher.add_done_callback(_background_tasks.discard)
+                    return (
+                        KubectlStructuredOutput(
+                            command=command_ready.result(), reason="", title=""
+                        ),
+                        None,
+                    )
+                # command가 나오기 전에 스트림이 끝남 (거절/incomplete 등): 일반 응답과 동일하게 처리
+                response = task.result()
+                usage_info = self._extract_usage(response, model)
+            else:
+                response, usage_info = await _invoke(self.max_output_tokens)
+
+            reason = self._incomplete_reason(response)
+            if reason == "max_output_tokens":
+                # 출력 한도 부족이면 한도를 2배로 한 번만 재시도
+                response, usage_info = await _invoke(self.max_output_tokens * 2)
+                reason = self._incomplete_reason(response)
+            if reason is not None:
                 return f"kubectl # INCOMPLETE: {reason}", usage_info
 
             payload, refused = self._extract_structured_payload(response)
@@ -204,13 +702,78 @@ class ComplexCommandProcessor:
         except Exception as e:
             return f"kubectl # LLM_CALL_FAILED: {e}", usage_info
 
-    def process(
+    async def process(
         self,
         command: str,
     ) -> GeneratedCommand | str:
         """자연어 명령어를 kubectl 명령어로 변환."""
-        structured, usage_info = self._call_responses(command)
-
+        text = _canonical_command(command)
+        local = _match_local_template(text)
+        if local is not None:
+            return local
+
+        key = self._response_key(text)
+        cached = _response_cache.get(key)
+        if cached is not None:
+            # 캐시에는 usage 없이(불변 객체로) 저장하므로 복사 없이 그대로 반환
+            return cached
+
+        cached_error = _error_cache.get(key)
+        if cached_error is not None:
+            return cached_error
+
+        vector = None
+        if self.semantic_cache is not None:
+            try:
+                vector = await self.semantic_cache.embed(text)
+            except Exception as e:
+                logger.warning(f"Semantic cache embedding failed: {e}", extra={"request_id": "N/A"})
+            else:
+                similar = self.semantic_cache.lookup(vector)
+                if similar is not None:
+                    _response_cache[key] = similar
+                    return similar
+
+        generated, usage_info = await self._generate(command, self.model, vector)
+        # 모델마다 단가가 다르므로 승격해도 합산하지 않고 호출한 모델별로 따로 기록
+        usages = [usage_info] if usage_info is not None else []
+
+        # 저렴/빠른 기본 모델이 실패하면 상위 모델로 한 번 승격
+        if isinstance(generated, str) and self.fallback_model and self.fallback_model != self.model:
+            logger.info(
+                f"Escalating to {self.fallback_model}: {generated}",
+                extra={"request_id": "N/A"},
+            )
+            generated, usage_info = await self._generate(command, self.fallback_model, vector)
+            if usage_info is not None:
+                usages.append(usage_info)
+
+        if isinstance(generated, str):
+            _error_cache[key] = generated
+            return generated  # 에러 메시지
+
+        # 스트림 조기 반환 결과(reason/title 없음)는 _finish_stream이 전체 결과로 캐시한다
+        if generated.reason or generated.title:
+            # _generate 결과는 usage가 없는 상태 → 캐시에 그대로 저장하고 응답에만 usage를 붙인다
+            _response_cache[key] = generated
+            if self.semantic_cache is not None and vector is not None:
+                self.semantic_cache.add(vector, generated)
+        return replace(generated, usages=tuple(usages))
+
+    async def _generate(
+        self,
+        command: str,
+        model: str,
+        vector: npt.NDArray[np.float32] | None = None,
+    ) -> tuple[GeneratedCommand | str, UsageInfo | None]:
+        """지정한 모델로 한 번 생성 (usage는 GeneratedCommand와 별도로 반환)."""
+        structured, usage_info = await self._call_responses(command, model, vector)
+        return self._to_generated(structured), usage_info
+
+    def _to_generated(
+        self, structured: KubectlStructuredOutput | None | str
+    ) -> GeneratedCommand | str:
+        """파싱된 응답을 GeneratedCommand(usage 없음)로 변환, 실패 시 에러 메시지."""
         if isinstance(structured, str):
             return structured  # 에러 메시지
 
@@ -222,9 +785,13 @@ class ComplexCommandProcessor:
         if not kubectl_cmd.startswith("kubectl "):
             return "kubectl # UNABLE_TO_GENERATE"
 
+        # system 프롬프트가 변환 불가 시 돌려주게 한 "kubectl # UNABLE_TO_GENERATE"는 성공이 아니다
+        # (에러 캐시 대상 + 상위 모델 승격), 모델이 적은 사유를 에러 메시지에 붙인다
+        if _is_comment_command(kubectl_cmd):
+            return f"{kubectl_cmd}: {structured.reason}" if structured.reason else kubectl_cmd
+
         return GeneratedCommand(
             command=kubectl_cmd,
             reason=structured.reason,
             title=structured.title,
-            usage=usage_info,
         )
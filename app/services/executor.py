@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 import asyncio
+import shlex
 from dataclasses import dataclass
 
+from app.core.config import settings
 
-@dataclass
+# 한 번에 읽는 파이프 chunk 크기
+_READ_CHUNK_SIZE = 64 * 1024
+_TRUNCATED_MARKER = "\n... [output truncated]"
+
+
+@dataclass(slots=True, frozen=True)
 class CommandExecutionResult:
     """실행된 쉘 명령어의 결과를 표현하는 DTO"""
 
@@ -14,9 +21,30 @@ class CommandExecutionResult:
     stderr: str
 
 
+async def _read_bounded(stream: asyncio.StreamReader | None, max_bytes: int) -> str:
+    """스트림을 끝까지 읽되 앞쪽 max_bytes까지만 보관 (나머지는 버리고 잘림 표시)."""
+    if stream is None:
+        return ""
+    buffer = bytearray()
+    truncated = False
+    while chunk := await stream.read(_READ_CHUNK_SIZE):
+        remaining = max_bytes - len(buffer)
+        if remaining > 0:
+            buffer += chunk[:remaining]
+        if len(chunk) > remaining:
+            # 파이프가 가득 차 프로세스가 멈추지 않도록 나머지도 계속 읽어서 버린다
+            truncated = True
+
+    output = buffer.decode("utf-8", errors="replace").strip()
+    return output + _TRUNCATED_MARKER if truncated else output
+
+
 class CommandExecutor:
     """kubectl 과 같은 쉘 명령어를 실제로 실행"""
 
+    def __init__(self, max_output_bytes: int = settings.EXECUTOR_MAX_OUTPUT_BYTES) -> None:
+        self.max_output_bytes = max_output_bytes
+
     async def execute(
         self,
         command: str,
@@ -24,6 +52,8 @@ class CommandExecutor:
     ) -> CommandExecutionResult:
         """주어진 쉘 명령어를 비동기로 실행
 
+        /bin/sh를 거치지 않고 argv로 직접 실행한다 (파이프/리다이렉션 등 셸 문법은 해석되지 않음).
+
         Args:
             command: 실행할 쉘 명령어 문자열 (예: 'kubectl get pods -A')
             timeout: 명령어 실행 타임아웃 (초)
@@ -31,24 +61,55 @@ class CommandExecutor:
         Returns:
             CommandExecutionResult: 실행 결과 DTO
         """
-        process = await asyncio.create_subprocess_shell(
-            command,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
+        try:
+            argv = shlex.split(command)
+        except ValueError as e:
+            # 따옴표 짝이 맞지 않는 등 인자로 분리할 수 없는 명령
+            return CommandExecutionResult(
+                command=command,
+                return_code=-1,
+                stdout="",
+                stderr=f"Invalid command: {e}",
+            )
+        if not argv:
+            return CommandExecutionResult(
+                command=command,
+                return_code=-1,
+                stdout="",
+                stderr="Invalid command: empty",
+            )
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *argv,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            # 실행 파일이 없는 경우 등: 셸과 같은 127 종료 코드로 보고
+            return CommandExecutionResult(
+                command=command,
+                return_code=127,
+                stdout="",
+                stderr=f"{argv[0]}: {e.strerror or e}",
+            )
 
         try:
-            stdout_bytes, stderr_bytes = await asyncio.wait_for(
-                process.communicate(),
+            # stdout/stderr를 동시에 읽어야 한쪽 파이프가 가득 차 멈추지 않는다
+            stdout, stderr, _ = await asyncio.wait_for(
+                asyncio.gather(
+                    _read_bounded(process.stdout, self.max_output_bytes),
+                    _read_bounded(process.stderr, self.max_output_bytes),
+                    process.wait(),
+                ),
                 timeout=timeout,
             )
         except TimeoutError:
             process.kill()
+            # 좀비 프로세스가 남지 않도록 종료를 기다린다
+            await process.wait()
             raise
 
-        stdout = stdout_bytes.decode().strip()
-        stderr = stderr_bytes.decode().strip()
-
         return_code = process.returncode if process.returncode is not None else -1
 
         return CommandExecutionResult(
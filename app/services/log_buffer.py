@@ -0,0 +1,290 @@
+"""In-process buffer that batches request/usage log INSERTs."""
+
+import asyncio
+import logging
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, Generic, TypeVar
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.pg import get_pool
+from app.services.types import UsageInfo
+
+logger = logging.getLogger(__name__)
+
+# 요청 로그 1행 + 모델별 usage 로그 0~N행을 한 문장으로 INSERT.
+# 요청 로그 id(gen_random_uuid())를 RETURNING으로 받아 usage 로그에 연결하고,
+# usage는 컬럼별 배열($6~$9)로 받아 unnest 하므로 usage가 없는 행(빈 배열)은 usage INSERT가 0행이 된다.
+# 같은 문장을 executemany로 여러 행에 실행하면 parse/plan과 왕복 비용이 배치 단위로 분산된다.
+_INSERT_LOG_SQL = (
+    "WITH req AS ("
+    "INSERT INTO agent_request_logs "
+    "(raw_command, is_success, executed_command, error_message, session_id, requested_at) "
+    "VALUES ($1, $2, $3, $4, $5, now()) "
+    "RETURNING id"
+    ") "
+    "INSERT INTO api_usage_logs "
+    "(model, input_tokens, output_tokens, cached_tokens, session_id, request_log_id) "
+    "SELECT u.model, u.input_tokens, u.output_tokens, u.cached_tokens, $5, req.id "
+    "FROM req CROSS JOIN unnest($6::varchar[], $7::integer[], $8::integer[], $9::integer[]) "
+    "AS u(model, input_tokens, output_tokens, cached_tokens)"
+)
+
+# usage 단독 기록용 (스트리밍 조기 반환 후 뒤늦게 도착한 usage, UsageService.log_usage_batched).
+# 요청 로그와 연결할 RETURNING이 없으므로 배치 전체를 컬럼별 배열로 넘겨 한 문장(unnest)으로 INSERT.
+_INSERT_USAGE_LOG_SQL = (
+    "INSERT INTO api_usage_logs "
+    "(model, input_tokens, output_tokens, cached_tokens, session_id, request_log_id) "
+    "SELECT * FROM unnest("
+    "$1::varchar[], $2::integer[], $3::integer[], $4::integer[], $5::uuid[], $6::uuid[]"
+    ")"
+)
+
+# 배치의 모델별 합계를 api_usage_daily에 누적 (INSERT와 같은 트랜잭션 → now()가 created_at과 같은 날짜).
+# 모델 순으로 정렬된 배열을 넘겨 동시 flush 간 행 잠금 순서를 고정한다.
+_UPSERT_USAGE_DAILY_SQL = (
+    "INSERT INTO api_usage_daily AS d "
+    "(day, model, input_tokens, output_tokens, cached_tokens, request_count) "
+    "SELECT (now() AT TIME ZONE 'UTC')::date, t.* FROM unnest("
+    "$1::varchar[], $2::bigint[], $3::bigint[], $4::bigint[], $5::bigint[]"
+    ") AS t(model, input_tokens, output_tokens, cached_tokens, request_count) "
+    "ON CONFLICT (day, model) DO UPDATE SET "
+    "input_tokens = d.input_tokens + EXCLUDED.input_tokens, "
+    "output_tokens = d.output_tokens + EXCLUDED.output_tokens, "
+    "cached_tokens = d.cached_tokens + EXCLUDED.cached_tokens, "
+    "request_count = d.request_count + EXCLUDED.request_count"
+)
+
+# _INSERT_LOG_SQL의 바인드 파라미터 순서와 동일
+LogRow = tuple[
+    str, bool, str | None, str | None, UUID | None, list[str], list[int], list[int], list[int]
+]
+
+# _INSERT_USAGE_LOG_SQL의 바인드 파라미터 순서와 동일
+UsageLogRow = tuple[str, int, int, int, UUID | None, UUID | None]
+
+RowT = TypeVar("RowT", bound=tuple[Any, ...])
+
+# 배치 INSERT 재시도 대기 (초), 시도마다 2배
+_RETRY_BASE_DELAY = 0.5
+
+# 행에서 추출한 usage 1건 (model, input_tokens, output_tokens, cached_tokens)
+UsageFields = tuple[str, int, int, int]
+
+
+def make_log_row(
+    *,
+    raw_command: str,
+    session_id: UUID | None,
+    executed_command: str | None,
+    is_success: bool,
+    error_message: str | None,
+    usages: Sequence[UsageInfo] = (),
+) -> LogRow:
+    """Build a LogRow for the request log and one usage log per entry of ``usages``."""
+    return (
+        raw_command,
+        is_success,
+        executed_command,
+        error_message,
+        session_id,
+        [usage.model for usage in usages],
+        [usage.input_tokens for usage in usages],
+        [usage.output_tokens for usage in usages],
+        [usage.cached_tokens for usage in usages],
+    )
+
+
+def _request_row_usage(row: LogRow) -> Iterable[UsageFields]:
+    return zip(*row[5:], strict=True)
+
+
+def _usage_row_usage(row: UsageLogRow) -> Iterable[UsageFields]:
+    return (row[:4],)
+
+
+def _daily_totals(
+    usages: list[UsageFields],
+) -> tuple[list[str], list[int], list[int], list[int], list[int]]:
+    """배치의 usage를 모델별로 합산해 _UPSERT_USAGE_DAILY_SQL의 배열 파라미터로 반환."""
+    totals: dict[str, list[int]] = {}
+    for model, input_tokens, output_tokens, cached_tokens in usages:
+        acc = totals.get(model)
+        if acc is None:
+            totals[model] = [input_tokens, output_tokens, cached_tokens, 1]
+        else:
+            acc[0] += input_tokens
+            acc[1] += output_tokens
+            acc[2] += cached_tokens
+            acc[3] += 1
+    models = sorted(totals)
+    return (
+        models,
+        [totals[m][0] for m in models],
+        [totals[m][1] for m in models],
+        [totals[m][2] for m in models],
+        [totals[m][3] for m in models],
+    )
+
+
+async def write_usage_log(usage: UsageInfo) -> None:
+    """Queue a usage row that has no request log to link to."""
+    await usage_log_buffer.submit(
+        (usage.model, usage.input_tokens, usage.output_tokens, usage.cached_tokens, None, None)
+    )
+
+
+class LogBuffer(Generic[RowT]):
+    """Queue log rows and flush them in batches of ``sql`` with asyncpg executemany.
+
+    A background task drains up to ``max_batch`` rows, or whatever arrived within
+    ``flush_interval`` seconds of the first row, per INSERT batch. When the buffer
+    is not running (or the queue is full) rows are written immediately instead.
+    A failed batch is retried up to ``max_retries`` times with exponential backoff,
+    then dropped and counted in ``dropped_rows``.
+    Usages found by ``usage_of`` are added to the api_usage_daily rollup in the same
+    transaction. With ``columnar`` the batch is sent as one array parameter per column
+    (a single statement) instead of executemany, and ``async_commit`` skips waiting for
+    the WAL flush on commit.
+    """
+
+    def __init__(
+        self,
+        sql: str,
+        *,
+        name: str,
+        usage_of: Callable[[RowT], Iterable[UsageFields]],
+        max_batch: int,
+        flush_interval: float,
+        max_size: int,
+        max_retries: int = 0,
+        columnar: bool = False,
+        async_commit: bool = False,
+    ) -> None:
+        self.sql = sql
+        self.columnar = columnar
+        self.async_commit = async_commit
+        self.name = name
+        self.usage_of = usage_of
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        # 재시도까지 실패해 기록하지 못한 행 수 (종료 시 로그)
+        self.dropped_rows = 0
+        self._queue: asyncio.Queue[RowT | None] = asyncio.Queue(maxsize=max_size)
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush buffered rows and stop the background task."""
+        if self._task is None:
+            return
+        # sentinel: 앞에 쌓인 행을 모두 flush 한 뒤 종료
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def submit(self, row: RowT) -> None:
+        """Queue a row for the next batch (or write it now if the buffer cannot take it)."""
+        if self._task is not None:
+            try:
+                self._queue.put_nowait(row)
+                return
+            except asyncio.QueueFull:
+                logger.warning(
+                    "Log buffer is full, writing row directly",
+                    extra={"request_id": "log-buffer"},
+                )
+        await self._flush([row])
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            row = await self._queue.get()
+            if row is None:
+                return
+
+            batch = [row]
+            stopping = False
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: list[RowT]) -> None:
+        usages = [usage for row in batch for usage in self.usage_of(row)]
+        attempt = 0
+        while True:
+            try:
+                await self._write(batch, usages)
+                return
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    self.dropped_rows += len(batch)
+                    logger.exception(
+                        f"Dropped {len(batch)} {self.name}(s) after {attempt} retries",
+                        extra={"request_id": "log-buffer"},
+                    )
+                    return
+                # 짧은 DB 장애(재시작, failover)는 대기 후 같은 배치를 다시 기록
+                delay = _RETRY_BASE_DELAY * 2**attempt
+                attempt += 1
+                logger.warning(
+                    f"Failed to persist {len(batch)} {self.name}(s), retry {attempt} in {delay}s: {e}",
+                    extra={"request_id": "log-buffer"},
+                )
+                await asyncio.sleep(delay)
+
+    async def _write(self, batch: list[RowT], usages: list[UsageFields]) -> None:
+        pool = await get_pool()
+        async with pool.acquire() as conn, conn.transaction():
+            if self.async_commit:
+                # 이 트랜잭션만 commit 시 WAL fsync를 기다리지 않음 (장애 시 최근 수백 ms 로그 유실 가능)
+                await conn.execute("SET LOCAL synchronous_commit = off")
+            if self.columnar:
+                await conn.execute(self.sql, *map(list, zip(*batch, strict=True)))
+            else:
+                await conn.executemany(self.sql, batch)
+            if usages:
+                await conn.execute(_UPSERT_USAGE_DAILY_SQL, *_daily_totals(usages))
+
+
+# Process-wide buffers, started/stopped with the application (app.main)
+log_buffer: LogBuffer[LogRow] = LogBuffer(
+    _INSERT_LOG_SQL,
+    name="agent request log",
+    usage_of=_request_row_usage,
+    max_batch=settings.LOG_BUFFER_MAX_BATCH,
+    flush_interval=settings.LOG_BUFFER_FLUSH_INTERVAL_MS / 1000,
+    max_size=settings.LOG_BUFFER_MAX_SIZE,
+    max_retries=settings.LOG_BUFFER_MAX_RETRIES,
+    async_commit=settings.LOG_BUFFER_ASYNC_COMMIT,
+)
+usage_log_buffer: LogBuffer[UsageLogRow] = LogBuffer(
+    _INSERT_USAGE_LOG_SQL,
+    name="API usage log",
+    usage_of=_usage_row_usage,
+    max_batch=settings.LOG_BUFFER_MAX_BATCH,
+    flush_interval=settings.LOG_BUFFER_FLUSH_INTERVAL_MS / 1000,
+    max_size=settings.LOG_BUFFER_MAX_SIZE,
+    max_retries=settings.LOG_BUFFER_MAX_RETRIES,
+    columnar=True,
+    async_commit=settings.LOG_BUFFER_ASYNC_COMMIT,
+)
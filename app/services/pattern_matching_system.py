@@ -1,4 +1,5 @@
 import re
+import shlex
 from typing import TypedDict  # TypedDict와 List를 추가로 임포트했습니다.
 
 from app.services.complex_command_processor import ComplexCommandProcessor
@@ -32,6 +33,16 @@ SIMPLE_COMMAND_DEFINITION: list[CommandDefinition] = [
     },
 ]
 
+# intent_key → 정의 (요청마다 리스트를 순회하지 않도록 import 시 1회 구성)
+_DEFS_BY_KEY: dict[str, CommandDefinition] = {d["intent_key"]: d for d in SIMPLE_COMMAND_DEFINITION}
+
+# intent_key → (kubectl 동작, 리소스)
+_INTENT_MAP: dict[str, tuple[str, str | None]] = {
+    "pod_list": ("get", "pods"),
+    "service_status": ("get", "services"),
+    "pod_logs": ("logs", None),
+}
+
 # 자연어 토큰 → kubectl-friendly 토큰 정규화
 CANONICAL_TARGET_MAP: dict[str, str] = {
     # 파드
@@ -52,6 +63,59 @@ CANONICAL_TARGET_MAP: dict[str, str] = {
 }
 
 
+# 사용자가 처음부터 kubectl 명령을 입력한 경우 그대로 통과시킬 서브커맨드.
+# LLM/검토 단계를 건너뛰므로 클러스터 상태를 바꾸지 않는 읽기 전용 명령만 허용
+_KUBECTL_VERBS: frozenset[str] = frozenset(
+    {
+        "get",
+        "describe",
+        "logs",
+        "top",
+        "explain",
+        "events",
+        "api-resources",
+        "version",
+        "cluster-info",
+    }
+)
+
+# 명령 연결/치환/리다이렉션에 쓰이는 셸 메타문자 (포함되면 통과시키지 않음)
+_SHELL_METACHARS: frozenset[str] = frozenset(";|&$`<>\n\r")
+
+# kubectl 직접 입력 통과 횟수 (LLM 호출 없이 처리된 비율 확인용)
+_passthrough_hits = 0
+
+
+def kubectl_passthrough_hits() -> int:
+    """Return how many commands were passed through as already-typed kubectl commands."""
+    return _passthrough_hits
+
+
+def kubectl_passthrough(raw_command: str) -> GeneratedCommand | None:
+    """입력이 이미 읽기 전용 kubectl 명령이면 LLM 없이 사용.
+
+    허용 목록 밖의 서브커맨드, 셸 메타문자, 깨진 인용이 있으면 None.
+    정규화(소문자 변환, 조사 제거)는 `-A` 같은 플래그를 망가뜨리므로 원문을 받고,
+    반환하는 명령은 입력 문자열 대신 분리한 argv를 다시 인용(shlex.join)해 만든다.
+    """
+    global _passthrough_hits
+    command = raw_command.strip()
+    if not command.startswith("kubectl ") or not _SHELL_METACHARS.isdisjoint(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if len(argv) < 2 or argv[1] not in _KUBECTL_VERBS:
+        return None
+    _passthrough_hits += 1
+    return GeneratedCommand(
+        command=shlex.join(argv),
+        reason="입력된 kubectl 명령어 그대로 사용",
+        title=f"Run kubectl {argv[1]}",
+    )
+
+
 class PatternMatchingSystem:
     """
     정규화된 명령어를 기반으로 단순 명령 패턴을 매칭하고 파라미터를 추출하여
@@ -64,17 +128,12 @@ class PatternMatchingSystem:
     ) -> None:
         self.complex_command_handler = complex_command_handler
 
-        # intent_key 기준으로 keyword 패턴 구성
-        # 예: "pod_list" -> /(pod 목록|파드 목록|...)/
-        self.patterns: dict[str, re.Pattern[str]] = {}
-        # 3. definition의 타입을 CommandDefinition으로 명시하여 mypy 오류를 방지합니다.
-        for cmd_def in SIMPLE_COMMAND_DEFINITION:
-            # cmd_def는 이제 CommandDefinition 타입으로 인식됩니다.
-            intent_key = cmd_def["intent_key"]
-            keywords = cmd_def["keywords"]
-
-            pattern_str = "|".join(re.escape(kw) for kw in keywords)
-            self.patterns[intent_key] = re.compile(pattern_str)
+        # 키워드는 모두 리터럴이므로 정규식 대신 부분 문자열 검사로 인텐트 결정
+        # (SIMPLE_COMMAND_DEFINITION 순서상 먼저 정의된 인텐트가 우선)
+        self.intent_keywords: tuple[tuple[str, tuple[str, ...]], ...] = tuple(
+            (cmd_def["intent_key"], tuple(cmd_def["keywords"]))
+            for cmd_def in SIMPLE_COMMAND_DEFINITION
+        )
 
         # 필터링 옵션 패턴 정의
         self.filter_patterns: dict[str, re.Pattern[str]] = {
@@ -88,6 +147,14 @@ class PatternMatchingSystem:
             "container": re.compile(r"(?:컨테이너|c)\s*([가-힣a-zA-Z0-9_-]+)"),
         }
 
+    def _match_intent(self, command: str) -> str | None:
+        """명령어에 포함된 키워드로 인텐트 결정 (없으면 None)."""
+        for intent_key, keywords in self.intent_keywords:
+            for keyword in keywords:
+                if keyword in command:
+                    return intent_key
+        return None
+
     def _canonicalize_target(
         self,
         value: str | None,
@@ -140,10 +207,7 @@ class PatternMatchingSystem:
         intent_key 와 필터 정보를 바탕으로 최종 kubectl 명령어 생성
         """
         # definition은 CommandDefinition 타입으로 인식됩니다.
-        definition = next(
-            (d for d in SIMPLE_COMMAND_DEFINITION if d["intent_key"] == intent_key),
-            None,
-        )
+        definition = _DEFS_BY_KEY.get(intent_key)
         if definition is None:
             # 정의 안 된 인텐트면 그냥 fallback
             return GeneratedCommand(
@@ -210,36 +274,26 @@ class PatternMatchingSystem:
         command_str = " ".join(parts)
         return GeneratedCommand(command=command_str, reason=reason, title=title)
 
-    def process_command(
+    async def process_command(
         self,
         normalized_command: str,
     ) -> GeneratedCommand | str:
         """
         정규화된 명령어를 분석하여 kubectl 명령어를 반환
         """
-        intent_map: dict[str, tuple[str, str | None]] = {
-            "pod_list": ("get", "pods"),
-            "service_status": ("get", "services"),
-            "pod_logs": ("logs", None),
-        }
-
-        best_match: str | None = None
-        for key, pattern in self.patterns.items():
-            if pattern.search(normalized_command):
-                best_match = key
-                break
+        best_match = self._match_intent(normalized_command)
 
         if best_match is None:
             # 단순 패턴 매칭 실패 시 ComplexCommandProcessor로 위임
-            return self.complex_command_handler.process(normalized_command)
+            return await self.complex_command_handler.process(normalized_command)
 
-        intent, resource = intent_map[best_match]
+        intent, resource = _INTENT_MAP[best_match]
 
         filters = self._extract_filters(normalized_command)
 
         # 로그는 타겟이 없으면 ComplexCommandProcessor로 넘김
         if intent == "logs" and not filters.get("label"):
-            return self.complex_command_handler.process(normalized_command)
+            return await self.complex_command_handler.process(normalized_command)
 
         return self._build_command(
             intent_key=best_match,
@@ -0,0 +1,112 @@
+"""Embedding-based semantic cache for LLM-generated commands.
+
+Requires the optional ``semantic-cache`` extra (numpy).
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from functools import partial
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.services.complex_command_processor import _call_with_retries
+from app.services.types import GeneratedCommand
+
+try:
+    import numpy as np
+    import numpy.typing as npt
+except ImportError as e:  # pragma: no cover - optional dependency
+    raise ImportError(
+        "SEMANTIC_CACHE_ENABLED requires numpy: pip install 'aklp-agent[semantic-cache]'"
+    ) from e
+
+
+class SemanticCache:
+    """요청 문장 임베딩의 cosine 유사도로 이전 생성 결과를 재사용하는 캐시.
+
+    벡터는 단위 길이로 정규화한 float32 행렬에 보관하므로 행렬-벡터 곱 한 번이 곧
+    전체 항목과의 cosine 유사도다. 가득 차면 가장 오래 적중하지 않은 항목을 덮어쓴다 (LRU).
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        *,
+        model: str,
+        threshold: float,
+        max_entries: int,
+        timeout: float | httpx.Timeout,
+    ) -> None:
+        self.client = client
+        self.model = model
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.timeout = timeout
+
+        # 차원 수는 첫 임베딩에서 결정
+        self._vectors: npt.NDArray[np.float32] | None = None
+        self._entries: list[GeneratedCommand] = []
+        # 항목별 마지막 사용 시각 (단조 증가 카운터). 가득 차면 최솟값 위치를 교체
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._clock = 0
+
+    async def embed(self, text: str) -> npt.NDArray[np.float32]:
+        """텍스트를 단위 길이로 정규화된 임베딩 벡터로 변환.
+
+        공유 클라이언트는 max_retries=0이므로 generation 호출과 같이 _call_with_retries로
+        동시 호출 수 제한과 재시도를 적용한다.
+        """
+        response = await _call_with_retries(
+            partial(
+                self.client.embeddings.create,
+                model=self.model,
+                input=text,
+                timeout=self.timeout,
+            )
+        )
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def lookup(self, vector: npt.NDArray[np.float32]) -> GeneratedCommand | None:
+        """유사도가 threshold 이상인 가장 가까운 항목 반환 (usage 없는 항목)."""
+        if self._vectors is None or not self._entries:
+            return None
+
+        scores = self._vectors[: len(self._entries)] @ vector
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        self._touch(best)
+        return self._entries[best]
+
+    def add(self, vector: npt.NDArray[np.float32], generated: GeneratedCommand) -> None:
+        """새 항목 추가 (가득 찼으면 가장 오래 사용되지 않은 항목을 교체)."""
+        if self._vectors is None:
+            self._vectors = np.empty((self.max_entries, vector.shape[0]), dtype=np.float32)
+
+        # GeneratedCommand는 불변이므로 usage가 없으면 그대로 공유
+        entry = replace(generated, usages=()) if generated.usages else generated
+        if len(self._entries) < self.max_entries:
+            index = len(self._entries)
+            self._entries.append(entry)
+        else:
+            index = int(np.argmin(self._last_used))
+            self._entries[index] = entry
+        self._vectors[index] = vector
+        self._touch(index)
+
+    def _touch(self, index: int) -> None:
+        self._clock += 1
+        self._last_used[index] = self._clock
+
+    def clear(self) -> None:
+        """모든 항목 삭제."""
+        self._vectors = None
+        self._entries.clear()
+        self._last_used.fill(0)
+        self._clock = 0
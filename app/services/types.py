@@ -1,20 +1,22 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UsageInfo:
     """OpenAI API 사용량 정보."""
 
+    model: str  # 응답을 생성한 모델
     input_tokens: int
     output_tokens: int
     cached_tokens: int = 0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GeneratedCommand:
-    """구성된 kubectl 명령과 부가 설명."""
+    """구성된 kubectl 명령과 부가 설명 (캐시에서 공유되므로 불변)."""
 
     command: str
     reason: str
     title: str
-    usage: UsageInfo | None = None
+    # 호출한 모델별 사용량 (LLM 미호출 시 비어 있음, 상위 모델 승격 시 기본/상위 모델 각각 1건)
+    usages: tuple[UsageInfo, ...] = ()
@@ -2,15 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime, time
 from decimal import Decimal
+from functools import lru_cache
 from uuid import UUID
 
-from sqlalchemy import func, select
+from cachetools import TTLCache
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Date,
+    SQLColumnExpression,
+    case,
+    cast,
+    func,
+    insert,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.usage import APIUsageLog
+from app.core.config import settings
+from app.models.usage import APIUsageDaily, APIUsageLog
+from app.services.log_buffer import usage_log_buffer
 
 # 가격 정보 (per 1M tokens)
 PRICING: dict[str, dict[str, Decimal]] = {
@@ -28,8 +45,24 @@ PRICING: dict[str, dict[str, Decimal]] = {
 
 DEFAULT_PRICING = PRICING["gpt-5-mini"]
 
+# 정수 가격 (micro-USD per 1M tokens): (input, cached, output).
+# 토큰 수 x 이 값은 1e-12 USD 단위 정수이므로 비용 계산은 int 연산만으로 끝나고,
+# Decimal 변환은 최종 결과에서 한 번만 한다.
+PRICING_MICRO: dict[str, tuple[int, int, int]] = {
+    model: (
+        int(prices["input"] * 1_000_000),
+        int(prices["cached"] * 1_000_000),
+        int(prices["output"] * 1_000_000),
+    )
+    for model, prices in PRICING.items()
+}
+DEFAULT_PRICING_MICRO = PRICING_MICRO["gpt-5-mini"]
+
+# calculate_cost_micros 결과 → USD
+_COST_UNITS_PER_USD = Decimal(1_000_000_000_000)
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UsageStats:
     """Usage statistics data class."""
 
@@ -43,13 +76,55 @@ class UsageStats:
     period_end: datetime | None
 
 
-def calculate_cost(
+# period → 최근 집계 결과. 대시보드 polling이 매번 집계 SQL을 실행하지 않도록 짧은 TTL로 재사용
+# (누적 카운터라 TTL 동안 조금 뒤처져도 무방). 동시 miss는 period별 lock으로 묶어 한 번만 조회한다
+# (한 period의 느린 집계가 다른 period의 miss를 막지 않음).
+_stats_cache: TTLCache[str, UsageStats] = TTLCache(
+    maxsize=8, ttl=max(settings.USAGE_STATS_CACHE_TTL, 1)
+)
+_stats_locks: dict[str, asyncio.Lock] = {}
+
+
+@lru_cache(maxsize=2)
+def _period_boundaries(today: date) -> tuple[datetime, datetime]:
+    """(오늘 0시, 이번 달 1일 0시) UTC. 날짜가 바뀔 때만 다시 계산 (순수 함수)."""
+    return (
+        datetime.combine(today, time.min, tzinfo=UTC),
+        datetime.combine(today.replace(day=1), time.min, tzinfo=UTC),
+    )
+
+
+def _cost_micros_expr(
+    model: SQLColumnExpression[str],
+    input_tokens: SQLColumnExpression[int],
+    output_tokens: SQLColumnExpression[int],
+    cached_tokens: SQLColumnExpression[int],
+) -> ColumnElement[int]:
+    """SQL expression equivalent of calculate_cost_micros for one row, priced by its model.
+
+    Token columns are cast to bigint first: integer x micro-USD rate overflows int4.
+    """
+
+    def rate(index: int) -> ColumnElement[int]:
+        return case(
+            {name: rates[index] for name, rates in PRICING_MICRO.items()},
+            value=model,
+            else_=DEFAULT_PRICING_MICRO[index],
+        )
+
+    input_big = cast(input_tokens, BigInteger)
+    cached_big = cast(cached_tokens, BigInteger)
+    output_big = cast(output_tokens, BigInteger)
+    return (input_big - cached_big) * rate(0) + cached_big * rate(1) + output_big * rate(2)
+
+
+def calculate_cost_micros(
     input_tokens: int,
     output_tokens: int,
     cached_tokens: int,
     model: str,
-) -> Decimal:
-    """Calculate cost based on token usage.
+) -> int:
+    """Calculate cost in 1e-12 USD units (token count x micro-USD per 1M tokens).
 
     Args:
         input_tokens: Total input tokens (includes cached)
@@ -58,18 +133,35 @@ def calculate_cost(
         model: Model name for pricing lookup
 
     Returns:
-        Total cost in USD
+        Total cost as an integer number of 1e-12 USD
     """
-    pricing = PRICING.get(model, DEFAULT_PRICING)
+    input_rate, cached_rate, output_rate = PRICING_MICRO.get(model, DEFAULT_PRICING_MICRO)
 
     # cached_tokens는 input_tokens에 포함되어 있으므로 분리 계산
     regular_input = input_tokens - cached_tokens
 
-    input_cost = (Decimal(regular_input) / 1_000_000) * pricing["input"]
-    cached_cost = (Decimal(cached_tokens) / 1_000_000) * pricing["cached"]
-    output_cost = (Decimal(output_tokens) / 1_000_000) * pricing["output"]
+    return regular_input * input_rate + cached_tokens * cached_rate + output_tokens * output_rate
+
+
+def calculate_cost(
+    input_tokens: int,
+    output_tokens: int,
+    cached_tokens: int,
+    model: str,
+) -> Decimal:
+    """Calculate cost based on token usage.
+
+    Args:
+        input_tokens: Total input tokens (includes cached)
+        output_tokens: Output tokens
+        cached_tokens: Cached input tokens (subset of input_tokens)
+        model: Model name for pricing lookup
 
-    return input_cost + cached_cost + output_cost
+    Returns:
+        Total cost in USD
+    """
+    micros = calculate_cost_micros(input_tokens, output_tokens, cached_tokens, model)
+    return Decimal(micros) / _COST_UNITS_PER_USD
 
 
 class UsageService:
@@ -91,9 +183,15 @@ class UsageService:
         cached_tokens: int = 0,
         session_id: UUID | None = None,
         request_log_id: UUID | None = None,
+        *,
+        autocommit: bool = False,
     ) -> APIUsageLog:
         """Log API usage to database.
 
+        The rows are written in the session's current transaction and committed by the
+        caller (e.g. ``async with db.begin():``), so several usage events in one request
+        share a single commit. Pass ``autocommit=True`` for a standalone call.
+
         Args:
             model: Model name used
             input_tokens: Number of input tokens
@@ -101,11 +199,51 @@ class UsageService:
             cached_tokens: Number of cached tokens
             session_id: Optional session ID
             request_log_id: Optional request log ID for correlation
+            autocommit: Commit the session right after the INSERT
 
         Returns:
-            Created APIUsageLog record
+            Created APIUsageLog record (detached; id/created_at come from RETURNING)
         """
-        log = APIUsageLog(
+        # Core INSERT ... RETURNING (ORM unit-of-work/identity map를 거치지 않음).
+        # 일 단위 집계 upsert를 data-modifying CTE로 묶어 왕복 1번에 끝낸다 (같은 now()).
+        inserted = (
+            insert(APIUsageLog)
+            .values(
+                model=model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cached_tokens=cached_tokens,
+                session_id=session_id,
+                request_log_id=request_log_id,
+            )
+            .returning(APIUsageLog.id, APIUsageLog.created_at)
+            .cte("inserted")
+        )
+        daily = pg_insert(APIUsageDaily).values(
+            day=cast(func.timezone("UTC", func.now()), Date),
+            model=model,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            cached_tokens=cached_tokens,
+            request_count=1,
+        )
+        rollup = daily.on_conflict_do_update(
+            index_elements=[APIUsageDaily.day, APIUsageDaily.model],
+            set_={
+                "input_tokens": APIUsageDaily.input_tokens + daily.excluded.input_tokens,
+                "output_tokens": APIUsageDaily.output_tokens + daily.excluded.output_tokens,
+                "cached_tokens": APIUsageDaily.cached_tokens + daily.excluded.cached_tokens,
+                "request_count": APIUsageDaily.request_count + daily.excluded.request_count,
+            },
+        ).cte("rollup")
+        result = await self.db.execute(select(inserted.c.id, inserted.c.created_at).add_cte(rollup))
+        log_id, created_at = result.one()
+        if autocommit:
+            await self.db.commit()
+
+        return APIUsageLog(
+            id=log_id,
+            created_at=created_at,
             model=model,
             input_tokens=input_tokens,
             output_tokens=output_tokens,
@@ -113,10 +251,33 @@ class UsageService:
             session_id=session_id,
             request_log_id=request_log_id,
         )
-        self.db.add(log)
-        await self.db.commit()
-        await self.db.refresh(log)
-        return log
+
+    async def log_usage_batched(
+        self,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        cached_tokens: int = 0,
+        session_id: UUID | None = None,
+        request_log_id: UUID | None = None,
+    ) -> None:
+        """Queue API usage for the batched INSERT instead of committing it now.
+
+        Rows are flushed by usage_log_buffer as a single INSERT ... SELECT FROM
+        unnest() statement per batch (one array parameter per column), so no
+        APIUsageLog is returned. Use log_usage() when the created record is needed.
+
+        Args:
+            model: Model name used
+            input_tokens: Number of input tokens
+            output_tokens: Number of output tokens
+            cached_tokens: Number of cached tokens
+            session_id: Optional session ID
+            request_log_id: Optional request log ID for correlation
+        """
+        await usage_log_buffer.submit(
+            (model, input_tokens, output_tokens, cached_tokens, session_id, request_log_id)
+        )
 
     async def get_stats(self, period: str = "all") -> UsageStats:
         """Get aggregated usage statistics.
@@ -125,49 +286,79 @@ class UsageService:
             period: One of "today", "month", or "all"
 
         Returns:
-            UsageStats with aggregated data
+            UsageStats with aggregated data (cached for USAGE_STATS_CACHE_TTL seconds)
         """
+        if settings.USAGE_STATS_CACHE_TTL <= 0:
+            return await self._query_stats(period)
+
+        stats = _stats_cache.get(period)
+        if stats is not None:
+            return stats
+        lock = _stats_locks.get(period)
+        if lock is None:
+            lock = _stats_locks[period] = asyncio.Lock()
+        async with lock:
+            # lock을 기다리는 동안 다른 요청이 채웠을 수 있음
+            stats = _stats_cache.get(period)
+            if stats is None:
+                stats = await self._query_stats(period)
+                _stats_cache[period] = stats
+        return stats
+
+    async def _query_stats(self, period: str) -> UsageStats:
+        """Run the aggregate query for get_stats."""
+        # 기간 경계는 Python에서 계산해 bind parameter로 넘긴다 (PK 선두 컬럼 day의 범위 비교).
         now = datetime.now(UTC)
+        today_start, month_start = _period_boundaries(now.date())
         period_start: datetime | None = None
         period_end: datetime | None = now
 
         if period == "today":
             # Start of today (UTC)
-            period_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            period_start = today_start
         elif period == "month":
             # Start of current month (UTC)
-            period_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            period_start = month_start
         else:
             # "all" - no date filter
             period_start = None
             period_end = None
 
-        # Build query
+        # api_usage_daily는 INSERT와 같은 트랜잭션에서 갱신되므로 오늘 분량까지 반영되어 있다.
+        # 기간 내 (일 x 모델) 행만 읽으면 되므로 원본 로그 테이블은 스캔하지 않는다.
+        daily = APIUsageDaily
         query = select(
-            func.coalesce(func.sum(APIUsageLog.input_tokens), 0).label("total_input"),
-            func.coalesce(func.sum(APIUsageLog.output_tokens), 0).label("total_output"),
-            func.coalesce(func.sum(APIUsageLog.cached_tokens), 0).label("total_cached"),
-            func.count(APIUsageLog.id).label("request_count"),
+            func.coalesce(func.sum(daily.input_tokens), 0).label("total_input"),
+            func.coalesce(func.sum(daily.output_tokens), 0).label("total_output"),
+            func.coalesce(func.sum(daily.cached_tokens), 0).label("total_cached"),
+            func.coalesce(func.sum(daily.request_count), 0).label("request_count"),
+            func.coalesce(
+                func.sum(
+                    _cost_micros_expr(
+                        daily.model,
+                        daily.input_tokens,
+                        daily.output_tokens,
+                        daily.cached_tokens,
+                    )
+                ),
+                0,
+            ).label("total_micros"),
         )
-
         if period_start is not None:
-            query = query.where(APIUsageLog.created_at >= period_start)
+            query = query.where(daily.day >= period_start.date())
 
         result = await self.db.execute(query)
-        row = result.one()
-
-        total_input = int(row.total_input)
-        total_output = int(row.total_output)
-        total_cached = int(row.total_cached)
-        request_count = int(row.request_count)
-
-        # Calculate cost (using default model for aggregated stats)
-        total_cost = calculate_cost(
-            input_tokens=total_input,
-            output_tokens=total_output,
-            cached_tokens=total_cached,
-            model="gpt-5-mini",
-        )
+        # Row는 tuple이므로 이름 조회 대신 위치로 바로 언패킹 (select 컬럼 순서와 동일)
+        total_input, total_output, total_cached, request_count, total_micros = result.one()
+
+        # bigint SUM()은 numeric(Decimal)으로 오므로 int 변환은 유지
+        total_input = int(total_input)
+        total_output = int(total_output)
+        total_cached = int(total_cached)
+        request_count = int(request_count)
+
+        # 비용은 행(모델)별 단가로 SQL에서 합산된 1e-12 USD 정수 → USD 변환만 수행
+        total_cost = Decimal(int(total_micros)) / _COST_UNITS_PER_USD
 
         return UsageStats(
             total_input_tokens=total_input,
@@ -179,3 +370,49 @@ class UsageService:
             period_start=period_start,
             period_end=period_end,
         )
+
+    async def ensure_partitions(self, months_ahead: int = 2) -> None:
+        """Make sure monthly api_usage_logs partitions exist up to `months_ahead` months.
+
+        Partitions are created ahead of time so rows never land in the default partition
+        (which would block creating the matching monthly partition later).
+        """
+        await self.db.execute(
+            text(
+                "SELECT create_api_usage_logs_partition("
+                "(date_trunc('month', now() AT TIME ZONE 'UTC') + make_interval(months => m))::date"
+                ") FROM generate_series(0, :months_ahead) AS m"
+            ),
+            {"months_ahead": months_ahead},
+        )
+        await self.db.commit()
+
+    async def drop_expired_partitions(self, retention_months: int) -> list[str]:
+        """Drop monthly api_usage_logs partitions older than `retention_months` months.
+
+        Retention is a metadata-only DROP TABLE per month instead of a DELETE scan.
+        The api_usage_daily rollup keeps the aggregated history, so stats are unaffected.
+
+        Returns:
+            Names of the dropped partitions
+        """
+        result = await self.db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = 'api_usage_logs' "
+                "AND c.relname ~ '^api_usage_logs_[0-9]{4}_[0-9]{2}$' "
+                "AND c.relname < 'api_usage_logs_' || to_char("
+                "date_trunc('month', now() AT TIME ZONE 'UTC')"
+                " - make_interval(months => :retention_months), 'YYYY_MM')"
+                " ORDER BY c.relname"
+            ),
+            {"retention_months": retention_months},
+        )
+        # 이름은 위 정규식으로 api_usage_logs_YYYY_MM 형태만 선택되므로 그대로 식별자로 사용
+        names = list(result.scalars())
+        for name in names:
+            await self.db.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+        await self.db.commit()
+        return names
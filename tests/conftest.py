@@ -0,0 +1,2 @@
+# app.core ↔ app.services 순환 import: app.core를 먼저 로드해야 개별 서비스 모듈을 import 할 수 있다
+import app.core  # noqa: F401
@@ -0,0 +1,29 @@
+import pytest
+
+from app.services.command_router import CommandRouter, normalize_cache_info
+
+
+@pytest.mark.parametrize(
+    ("raw_command", "expected"),
+    [
+        ("  모든 파드 목록 보여줘  ", "모든 파드 목록"),
+        ("default 네임스페이스 의 서비스 좀", "default 네임스페이스 의 서비스"),
+        ("nginx 파드 로그 를 확인해줘", "nginx 파드 로그"),
+        ("Pod   목록 알려줘", "pod 목록"),
+        # 종결어미를 먼저 지워야 조사가 독립된 단어가 된다
+        ("pod 이좀", "pod"),
+        ("nginx 로그 를좀", "nginx 로그"),
+        ("서비스 목록 은 부탁해", "서비스 목록"),
+    ],
+)
+def test_normalize_command(raw_command: str, expected: str) -> None:
+    assert CommandRouter().normalize_command(raw_command) == expected
+
+
+def test_normalize_cache_info_counts_hits() -> None:
+    router = CommandRouter()
+    router.normalize_command("캐시 확인용 명령 좀")
+    before = normalize_cache_info()
+    router.normalize_command("캐시 확인용 명령 좀")
+
+    assert normalize_cache_info().hits == before.hits + 1
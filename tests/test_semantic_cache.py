@@ -0,0 +1,39 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+import pytest
+from openai import APIConnectionError
+
+from app.services import complex_command_processor
+from app.services.semantic_cache import SemanticCache
+
+
+class _FlakyEmbeddings:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def create(self, **kwargs: Any) -> Any:
+        self.calls += 1
+        if self.calls == 1:
+            raise APIConnectionError(request=httpx.Request("POST", "https://api.openai.com"))
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[3.0, 4.0])])
+
+
+def test_embed_retries_transient_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(complex_command_processor, "_RETRY_BASE_DELAY", 0)
+    embeddings = _FlakyEmbeddings()
+    cache = SemanticCache(
+        SimpleNamespace(embeddings=embeddings),  # type: ignore[arg-type]
+        model="text-embedding-3-small",
+        threshold=0.9,
+        max_entries=4,
+        timeout=1.0,
+    )
+
+    vector = asyncio.run(cache.embed("모든 파드"))
+
+    # 공유 클라이언트는 자체 재시도가 없으므로 _call_with_retries가 다시 호출한다
+    assert embeddings.calls == 2
+    assert vector.tolist() == pytest.approx([0.6, 0.8])
@@ -0,0 +1,126 @@
+import asyncio
+from collections.abc import Iterator
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.usage import APIUsageLog
+from app.services import usage_service
+from app.services.usage_service import (
+    UsageService,
+    UsageStats,
+    _cost_micros_expr,
+    _stats_cache,
+    calculate_cost,
+    calculate_cost_micros,
+)
+
+
+@pytest.fixture
+def distinct_pricing(monkeypatch: pytest.MonkeyPatch) -> None:
+    # 모델별 단가 분리를 확인하도록 모델마다 다른 단가 (micro-USD per 1M tokens)
+    monkeypatch.setattr(
+        usage_service,
+        "PRICING_MICRO",
+        {"gpt-5-mini": (250_000, 25_000, 2_000_000), "gpt-5": (1_250_000, 125_000, 10_000_000)},
+    )
+    monkeypatch.setattr(usage_service, "DEFAULT_PRICING_MICRO", (250_000, 25_000, 2_000_000))
+
+
+def test_cost_splits_cached_input() -> None:
+    # 1M input 중 400k cached, 100k output (gpt-5-mini: 0.25 / 0.025 / 2.00 USD per 1M)
+    cost = calculate_cost(1_000_000, 100_000, 400_000, "gpt-5-mini")
+
+    assert cost == Decimal("0.15") + Decimal("0.01") + Decimal("0.2")
+
+
+def test_cost_is_exact_for_small_counts() -> None:
+    assert calculate_cost_micros(1, 1, 0, "gpt-5-mini") == 250_000 + 2_000_000
+    assert calculate_cost(1, 1, 0, "gpt-5-mini") == Decimal("0.00000225")
+
+
+@pytest.mark.usefixtures("distinct_pricing")
+def test_cost_uses_each_models_rate() -> None:
+    assert calculate_cost_micros(1_000, 100, 0, "gpt-5") == 1_000 * 1_250_000 + 100 * 10_000_000
+    assert calculate_cost_micros(1_000, 100, 0, "gpt-5-mini") == 1_000 * 250_000 + 100 * 2_000_000
+    # 알 수 없는 모델은 기본 단가
+    assert calculate_cost_micros(1_000, 100, 0, "unknown") == calculate_cost_micros(
+        1_000, 100, 0, "gpt-5-mini"
+    )
+
+
+@pytest.mark.usefixtures("distinct_pricing")
+def test_escalated_usage_is_priced_per_model() -> None:
+    primary = calculate_cost_micros(1_000, 50, 500, "gpt-5-mini")
+    fallback = calculate_cost_micros(1_200, 80, 0, "gpt-5")
+    # 두 호출을 상위 모델 하나로 합산하면 기본 모델 호출이 상위 모델 단가로 과금된다
+    merged = calculate_cost_micros(2_200, 130, 500, "gpt-5")
+
+    assert primary + fallback < merged
+
+
+@pytest.mark.usefixtures("distinct_pricing")
+def test_sql_cost_expression_prices_by_model() -> None:
+    expr = _cost_micros_expr(
+        APIUsageLog.model,
+        APIUsageLog.input_tokens,
+        APIUsageLog.output_tokens,
+        APIUsageLog.cached_tokens,
+    )
+    sql = str(expr.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    # input / cached / output 단가가 각각 모델별 CASE로 들어간다
+    for when in (
+        "WHEN 'gpt-5' THEN 1250000 ",
+        "WHEN 'gpt-5' THEN 125000 ",
+        "WHEN 'gpt-5' THEN 10000000 ",
+        "WHEN 'gpt-5-mini' THEN 250000 ",
+        "WHEN 'gpt-5-mini' THEN 25000 ",
+        "WHEN 'gpt-5-mini' THEN 2000000 ",
+    ):
+        assert when in sql
+    assert "CAST(api_usage_logs.input_tokens AS BIGINT)" in sql
+
+
+@pytest.fixture
+def stats_cache() -> Iterator[None]:
+    _stats_cache.clear()
+    yield
+    _stats_cache.clear()
+
+
+def _stats(period: str) -> UsageStats:
+    return UsageStats(0, 0, 0, Decimal(0), 0, period, None, None)
+
+
+@pytest.mark.usefixtures("stats_cache")
+def test_slow_stats_refill_does_not_block_other_periods(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(usage_service.settings, "USAGE_STATS_CACHE_TTL", 30)
+    service = UsageService(db=None)  # type: ignore[arg-type]
+    queries: list[str] = []
+
+    async def main() -> None:
+        release_all = asyncio.Event()
+
+        async def fake_query(period: str) -> UsageStats:
+            queries.append(period)
+            if period == "all":
+                await release_all.wait()
+            return _stats(period)
+
+        monkeypatch.setattr(service, "_query_stats", fake_query)
+
+        slow = [asyncio.create_task(service.get_stats("all")) for _ in range(2)]
+        await asyncio.sleep(0)
+        # all 집계가 끝나지 않아도 today는 바로 조회된다
+        today = await asyncio.wait_for(service.get_stats("today"), timeout=1)
+        assert today.period == "today"
+
+        release_all.set()
+        assert [stats.period for stats in await asyncio.gather(*slow)] == ["all", "all"]
+
+    asyncio.run(main())
+
+    # 같은 period의 동시 miss는 한 번만 조회
+    assert queries == ["all", "today"]